@@ -2,109 +2,342 @@
 查询相关 API 路由。
 """
 
-from typing import Optional
+import base64
+import logging
+from time import perf_counter
+from typing import Callable, List, Literal, Optional, Tuple
 
 import numpy as np
+import orjson
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import Response
 
 from app.core.storage import task_storage
 from app.core.task_manager import get_simulation_task
-from app.models.grid import GridPoint, WaveGrid
+from app.models.grid import FrameLayout, GridPoint, WaveGrid
 from app.schemas.api import (
     ErrorResponse,
     PointQueryResponse,
     SimulationFramesResponse,
 )
-from app.schemas.data import SimulationFrame, SimulationStatus, WavePoint
-from app.services.interpolation import query_point
+from app.schemas.data import SimulationStatus
+from app.services.interpolation import query_point, query_point_from_frame
+from app.utils.coordinate import lonlat_to_xy_array
+from app.utils.jit import NUMBA_AVAILABLE, njit, prange
+from app.utils.numerical import find_nearest_index
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/query", tags=["query"])
 
 
-def _build_wave_grid_from_frames(frames, region):
+def _compute_frame_layout(point_lons: np.ndarray, point_lats: np.ndarray) -> FrameLayout:
     """
-    从frames列表构建WaveGrid（用于向后兼容）。
-    
+    由帧网格点坐标提取网格布局。
+
     Args:
-        frames: SimulationFrame列表
-        region: 区域配置
-    
+        point_lons: 帧网格点经度（帧内点顺序，同一任务的所有帧共享）
+        point_lats: 帧网格点纬度
+
     Returns:
-        WaveGrid对象
+        FrameLayout 对象
     """
-    if not frames:
-        return None
-    
-    # 从第一帧提取网格点信息
-    first_frame = frames[0]
-    
+    n_frame_points = len(point_lons)
+
     # 提取唯一的经纬度值（排序）
-    lons = sorted(set(p.lon for p in first_frame.points))
-    lats = sorted(set(p.lat for p in first_frame.points))
-    
-    # 创建经纬度到索引的映射
-    lon_to_idx = {lon: i for i, lon in enumerate(lons)}
-    lat_to_idx = {lat: i for i, lat in enumerate(lats)}
-    
-    # 创建GridPoint列表
+    lons = np.unique(point_lons)
+    lats = np.unique(point_lats)
+
+    # 帧内点序号 -> 网格点序号（lat 为外层、lon 为内层）
+    grid_index = (
+        np.searchsorted(lats, point_lats) * len(lons)
+        + np.searchsorted(lons, point_lons)
+    )
+
+    # 帧的点恰好铺满规则网格时，建立网格点序号 -> 帧内点序号的反向映射
+    point_order = None
+    if (
+        len(lons) * len(lats) == n_frame_points
+        and np.unique(grid_index).size == n_frame_points
+    ):
+        point_order = np.empty(n_frame_points, dtype=np.int64)
+        point_order[grid_index] = np.arange(n_frame_points)
+
+    return FrameLayout(
+        axis_lons=lons,
+        axis_lats=lats,
+        grid_index=grid_index,
+        point_order=point_order,
+    )
+
+
+def _frame_grid_points(layout: FrameLayout, region) -> List[GridPoint]:
+    """
+    按帧的网格布局创建网格点列表（lat 为外层、lon 为内层）。
+
+    Args:
+        layout: 帧的网格布局
+        region: 区域配置
+
+    Returns:
+        网格点列表
+    """
     # 使用区域的左下角作为原点
     origin_lon = region.lon_min
     origin_lat = region.lat_min
-    
-    from app.utils.coordinate import lonlat_to_xy
-    
-    grid_points = []
-    # 按照lat（从下到上），lon（从左到右）的顺序创建网格点
-    for lat in lats:
-        for lon in lons:
-            x, y = lonlat_to_xy(lon, lat, origin_lon, origin_lat)
-            # 使用深度范围的中间值作为默认深度
-            depth = (region.depth_min + region.depth_max) / 2.0
-            grid_points.append(GridPoint(x=x, y=y, lon=lon, lat=lat, depth=depth))
-    
-    # 提取时间数组
-    times = np.array([frame.time for frame in frames])
-    
-    # 创建高度数组 (n_times, n_points)
-    n_times = len(frames)
-    n_points = len(grid_points)
-    wave_heights = np.zeros((n_times, n_points))
-    
-    # 填充高度数据
-    for time_idx, frame in enumerate(frames):
-        # 创建当前帧的经纬度到高度的映射
-        frame_dict = {(p.lon, p.lat): p.wave_height for p in frame.points}
-        
-        # 填充高度数组
-        for point_idx, grid_point in enumerate(grid_points):
-            key = (grid_point.lon, grid_point.lat)
-            if key in frame_dict:
-                wave_heights[time_idx, point_idx] = frame_dict[key]
-    
-    return WaveGrid(
+
+    # 按照lat（从下到上），lon（从左到右）的顺序展开网格，整体做坐标转换
+    grid_lons, grid_lats = np.meshgrid(layout.axis_lons, layout.axis_lats)
+    grid_lons = grid_lons.ravel()
+    grid_lats = grid_lats.ravel()
+    xs, ys = lonlat_to_xy_array(grid_lons, grid_lats, origin_lon, origin_lat)
+
+    # 使用深度范围的中间值作为默认深度
+    depth = (region.depth_min + region.depth_max) / 2.0
+    return [
+        GridPoint(x=x, y=y, lon=lon, lat=lat, depth=depth)
+        for x, y, lon, lat in zip(
+            xs.tolist(), ys.tolist(), grid_lons.tolist(), grid_lats.tolist()
+        )
+    ]
+
+
+def _get_frame_layout(task) -> Optional[FrameLayout]:
+    """
+    获取帧的网格布局（缓存在任务上）。
+
+    同一任务所有帧共享网格点坐标，只需计算一次。
+
+    Args:
+        task: 模拟任务对象
+
+    Returns:
+        FrameLayout 对象，没有帧时返回 None
+    """
+    if task.frame_layout is None and task.frame_times.size > 0:
+        task.frame_layout = _compute_frame_layout(task.frame_lons, task.frame_lats)
+    return task.frame_layout
+
+
+@njit(cache=True, parallel=True)
+def _scatter_heights(frame_heights, idx_map, out):
+    """按 idx_map 将各帧高度写入网格列顺序：out[t, idx_map[j]] = frame_heights[t, j]。"""
+    n_frames, n_frame_points = frame_heights.shape
+    for t in prange(n_frames):
+        for j in range(n_frame_points):
+            out[t, idx_map[j]] = frame_heights[t, j]
+
+
+def _grid_ordered_heights(frame_heights, idx_map, n_points):
+    """
+    将 (n_frames, n_frame_points) 帧高度数组转为列顺序与网格点一致的数组。
+    """
+    n_frame_points = len(idx_map)
+
+    # 点顺序与网格一致时直接使用，否则按索引映射整体重排
+    if n_frame_points == n_points and np.array_equal(idx_map, np.arange(n_points)):
+        return frame_heights
+    wave_heights = np.zeros((len(frame_heights), n_points), dtype=frame_heights.dtype)
+    if NUMBA_AVAILABLE:
+        _scatter_heights(frame_heights, np.asarray(idx_map, dtype=np.int64), wave_heights)
+    else:
+        wave_heights[:, idx_map] = frame_heights
+    return wave_heights
+
+
+def _get_frames_wave_grid(task):
+    """
+    获取覆盖当前全部缓存帧的 WaveGrid（缓存在任务上，增量更新）。
+
+    网格点只在首次构建时计算一次；之后每次只丢弃已淘汰帧对应的行，
+    并追加新帧的高度行，不再逐帧重建整个网格。
+
+    Args:
+        task: 模拟任务对象
+
+    Returns:
+        WaveGrid对象，没有帧时返回 None
+    """
+    frame_times = task.frame_times
+    n_frames = len(frame_times)
+    if n_frames == 0:
+        return None
+
+    layout = _get_frame_layout(task)
+    wave_grid = task.frames_grid_cache
+    if wave_grid is not None:
+        cached_times = wave_grid.times
+        # 已淘汰的帧位于缓存前部，定位当前第一帧在缓存中的位置
+        start = int(np.searchsorted(cached_times, frame_times[0]))
+        n_kept = len(cached_times) - start
+        if n_kept == 0 or (
+            n_kept <= n_frames and cached_times[start] == frame_times[0]
+        ):
+            if start == 0 and n_kept == n_frames:
+                return wave_grid
+            new_heights = _grid_ordered_heights(
+                task.frame_heights[n_kept:],
+                layout.grid_index,
+                len(wave_grid.grid_points),
+            )
+            wave_grid.wave_heights = np.concatenate(
+                [wave_grid.wave_heights[start:], new_heights]
+            )
+            wave_grid.times = frame_times
+            return wave_grid
+
+    # 首次查询（或缓存与帧序列不一致）：完整构建
+    grid_points = _frame_grid_points(layout, task.region)
+    wave_grid = WaveGrid(
         grid_points=grid_points,
-        wave_heights=wave_heights,
-        times=times,
+        wave_heights=_grid_ordered_heights(
+            task.frame_heights, layout.grid_index, len(grid_points)
+        ),
+        times=frame_times,
     )
+    task.frames_grid_cache = wave_grid
+    return wave_grid
 
 
-def _find_closest_frame(frames, target_time):
+def _columns_payload(
+    time: float,
+    region,
+    lons: np.ndarray,
+    lats: np.ndarray,
+    heights: np.ndarray,
+    point_format: str,
+) -> dict:
     """
-    在给定的帧列表中找到时间最接近 target_time 的帧。
+    由单帧的经纬度、高度数组（SoA）直接构建可由 orjson 序列化的帧 dict 结构。
+
+    array 格式的点保留为 (n_points, 3) 数组，columns 格式（CompactSimulationFrame）
+    直接使用三个列数组，均由 orjson 直接序列化，不生成 Python 列表；
+    columns_f32 格式的海浪高度为 float32 二进制的 base64 编码。
     """
-    if not frames:
-        return None
-    
-    closest_frame = None
-    min_time_diff = float("inf")
-    
-    for frame in frames:
-        time_diff = abs(frame.time - target_time)
-        if time_diff < min_time_diff:
-            min_time_diff = time_diff
-            closest_frame = frame
-    
-    return closest_frame
+    if point_format in ("columns", "columns_f32"):
+        payload = {
+            "time": float(time),
+            "region": region.dict(),
+            "lon": lons,
+            "lat": lats,
+        }
+        if point_format == "columns_f32":
+            # 海浪高度按小端 float32 二进制打包为 base64，不逐个格式化浮点数
+            payload["wave_height_f32"] = base64.b64encode(
+                np.asarray(heights, dtype="<f4").tobytes()
+            ).decode("ascii")
+        else:
+            # 与其他格式一致按 float64 输出（float32 数组会被 orjson 按 float32 精度格式化）
+            payload["wave_height"] = np.asarray(heights, dtype=np.float64)
+        return payload
+    if point_format == "array":
+        points = np.column_stack((lons, lats, heights))
+    else:
+        points = [
+            {"lon": lon, "lat": lat, "wave_height": height}
+            for lon, lat, height in zip(lons.tolist(), lats.tolist(), heights.tolist())
+        ]
+    return {
+        "time": float(time),
+        "region": region.dict(),
+        "points": points,
+    }
+
+
+def _frame_payload(task, frame_idx: int, point_format: str) -> dict:
+    """由任务帧缓冲区的第 frame_idx 帧构建帧的 dict/list 结构。"""
+    return _columns_payload(
+        task.frame_times[frame_idx],
+        task.region,
+        task.frame_lons,
+        task.frame_lats,
+        task.frame_heights[frame_idx],
+        point_format,
+    )
+
+
+def _wave_grid_payload(task, time_idx: int, point_format: str) -> dict:
+    """由 wave_grid 的第 time_idx 个时刻构建帧的 dict/list 结构。"""
+    wave_grid = task.wave_grid
+    return _columns_payload(
+        wave_grid.times[time_idx],
+        task.region,
+        wave_grid.point_lons,
+        wave_grid.point_lats,
+        wave_grid.wave_heights[time_idx],
+        point_format,
+    )
+
+
+def _frame_source(
+    task,
+) -> Optional[Tuple[np.ndarray, Callable[[object, int, str], dict]]]:
+    """
+    选择任务帧数据的来源。
+
+    优先使用流式存储的帧缓冲区，不存在时使用 wave_grid（向后兼容）。
+
+    Returns:
+        (升序时间数组, 按时间索引构建帧 dict 结构的函数)，没有数据时返回 None
+    """
+    if task.frame_times.size > 0:
+        return task.frame_times, _frame_payload
+    if task.wave_grid is not None and task.wave_grid.times.size > 0:
+        return task.wave_grid.times, _wave_grid_payload
+    return None
+
+
+def _frame_json(
+    task,
+    frame_time: float,
+    point_format: str,
+    build_payload: Callable[[], dict],
+) -> bytes:
+    """
+    获取帧的 JSON 序列化结果（按点格式、帧时间缓存在任务上）。
+
+    帧生成后内容不再变化，因此只在首次请求时构建并序列化，之后直接复用。
+    已淘汰帧的缓存项由模拟循环在淘汰帧时同步清理。
+
+    Args:
+        task: 模拟任务对象
+        frame_time: 帧时间（缓存键）
+        point_format: 点的输出格式（"object"、"array"、"columns" 或 "columns_f32"）
+        build_payload: 缓存未命中时构建帧 dict/list 结构的函数
+
+    Returns:
+        帧的 JSON 字节串
+    """
+    cache = task.frame_json_cache.setdefault(point_format, {})
+    cached = cache.get(frame_time)
+    if cached is not None:
+        return cached
+
+    # array、columns 格式的点为 ndarray，由 orjson 在 C 层直接序列化
+    cached = orjson.dumps(build_payload(), option=orjson.OPT_SERIALIZE_NUMPY)
+    cache[frame_time] = cached
+    return cached
+
+
+def _frames_response(task, simulation_id: str, frame_json: bytes) -> Response:
+    """
+    由缓存的帧 JSON 拼接 SimulationFramesResponse 响应，跳过 Pydantic 模型构建与校验。
+
+    任务状态会变化，不参与缓存，每次请求时拼接。
+    """
+    status = SimulationStatus(task.status).value
+    content = b"".join(
+        [
+            b'{"simulation_id":',
+            orjson.dumps(simulation_id),
+            b',"status":',
+            orjson.dumps(status),
+            b',"frames":[',
+            frame_json,
+            b"]}",
+        ]
+    )
+    return Response(content=content, media_type="application/json")
 
 
 @router.get(
@@ -119,6 +352,15 @@ async def get_simulation_frames(
         description="指定时间（秒），相对于 t=0 的偏移。time=-1 表示最新帧",
         examples={"latest": {"value": -1.0}, "specific_time": {"value": 0.6}},
     ),
+    point_format: Literal["object", "array", "columns", "columns_f32"] = Query(
+        "object",
+        description=(
+            "点的输出格式：object 为 {lon, lat, wave_height} 对象（默认），"
+            "array 为 [lon, lat, wave_height] 数组（体积更小），"
+            "columns 为列式帧（lon、lat、wave_height 三个数组，不含 points），"
+            "columns_f32 为列式帧且海浪高度为 float32 二进制的 base64（wave_height_f32）"
+        ),
+    ),
 ) -> SimulationFramesResponse:
     """
     获取区域模拟结果帧（单时刻）。
@@ -128,6 +370,10 @@ async def get_simulation_frames(
     优先使用流式存储的frames，如果不存在则使用wave_grid（向后兼容）。
     
     特殊值：time=-1 表示使用最新帧的时间。
+
+    point_format=array 时帧为 ArraySimulationFrame 结构，每个点输出为 [lon, lat, wave_height]，不携带字段名；
+    point_format=columns / columns_f32 时帧为 CompactSimulationFrame 结构。
+    响应模型 SimulationFramesResponse 的帧为三种结构之一，OpenAPI 文档中均有描述。
     """
     task = get_simulation_task(simulation_id)
     if task is None:
@@ -135,119 +381,9 @@ async def get_simulation_frames(
             status_code=404, detail=f"Simulation {simulation_id} not found"
         )
 
-    # 处理 time=-1 的特殊情况（获取最新帧）
-    if time == -1:
-        if task.frames:
-            latest_frame = task.frames[-1]
-            return SimulationFramesResponse(
-                simulation_id=simulation_id,
-                status=task.status,
-                frames=[latest_frame],
-            )
-        elif task.wave_grid is not None and len(task.wave_grid.times) > 0:
-            # 从 wave_grid 获取最新帧
-            latest_time = task.wave_grid.times[-1]
-            time_idx = len(task.wave_grid.times) - 1
-            points = [
-                WavePoint(
-                    lon=point.lon,
-                    lat=point.lat,
-                    wave_height=float(
-                        task.wave_grid.wave_heights[time_idx, i]
-                    ),
-                )
-                for i, point in enumerate(task.wave_grid.grid_points)
-            ]
-            frame = SimulationFrame(
-                time=float(latest_time),
-                region=task.region,
-                points=points,
-            )
-            return SimulationFramesResponse(
-                simulation_id=simulation_id,
-                status=task.status,
-                frames=[frame],
-            )
-        else:
-            # 任务存在但没有数据，根据任务状态返回不同的错误信息
-            if task.status in ("running", "paused"):
-                raise HTTPException(
-                    status_code=404,
-                    detail=(
-                        f"Simulation {simulation_id} is {task.status} but has no results yet. "
-                        f"Please wait a few seconds and try again."
-                    ),
-                )
-            else:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"Simulation {simulation_id} has no results yet (status: {task.status})",
-                )
-    
-    # 获取指定时刻的数据
-    target_time = time
-    
-    # 检查缓存保留时间配置
-    cache_retention_time = task.time_config.cache_retention_time
-    if cache_retention_time is not None and task.frames:
-        latest_time = task.frames[-1].time
-        cache_time_range = (latest_time - cache_retention_time, latest_time)
-        if target_time < cache_time_range[0]:
-            raise HTTPException(
-                status_code=410,
-                detail=(
-                    f"请求的时间 {target_time:.2f} s 已超出缓存保留范围。"
-                    f"当前缓存范围: [{cache_time_range[0]:.2f}, {cache_time_range[1]:.2f}] s "
-                    f"(保留时间: {cache_retention_time:.2f} s)"
-                )
-            )
-    
-    # 优先使用流式存储的frames
-    if task.frames:
-        # 在frames中查找最接近的时间点
-        frames = task.frames
-        closest_frame = None
-        min_time_diff = float('inf')
-        
-        for frame in frames:
-            time_diff = abs(frame.time - target_time)
-            if time_diff < min_time_diff:
-                min_time_diff = time_diff
-                closest_frame = frame
-        
-        if closest_frame is not None:
-            return SimulationFramesResponse(
-                simulation_id=simulation_id,
-                status=task.status,
-                frames=[closest_frame],
-            )
-    elif task.wave_grid is not None:
-        # 从 wave_grid 获取指定时刻的数据
-        times = task.wave_grid.times
-        time_idx = np.argmin(np.abs(times - target_time))
-        actual_time = times[time_idx]
-        
-        points = [
-            WavePoint(
-                lon=point.lon,
-                lat=point.lat,
-                wave_height=float(
-                    task.wave_grid.wave_heights[time_idx, i]
-                ),
-            )
-            for i, point in enumerate(task.wave_grid.grid_points)
-        ]
-        frame = SimulationFrame(
-            time=float(actual_time),
-            region=task.region,
-            points=points,
-        )
-        return SimulationFramesResponse(
-            simulation_id=simulation_id,
-            status=task.status,
-            frames=[frame],
-        )
-    else:
+    # 数据来源（frames 或 wave_grid）只判断一次，之后两种来源共用同一条查找路径
+    frame_source = _frame_source(task)
+    if frame_source is None:
         # 任务存在但没有数据，根据任务状态返回不同的错误信息
         if task.status in ("running", "paused"):
             raise HTTPException(
@@ -257,11 +393,40 @@ async def get_simulation_frames(
                     f"Please wait a few seconds and try again."
                 ),
             )
-        else:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Simulation {simulation_id} has no results yet (status: {task.status})",
-            )
+        raise HTTPException(
+            status_code=404,
+            detail=f"Simulation {simulation_id} has no results yet (status: {task.status})",
+        )
+    times, build_payload = frame_source
+
+    if time == -1:
+        # 获取最新帧
+        time_idx = len(times) - 1
+    else:
+        # 检查缓存保留时间配置
+        cache_retention_time = task.time_config.cache_retention_time
+        if cache_retention_time is not None:
+            latest_time = float(times[-1])
+            cache_time_range = (latest_time - cache_retention_time, latest_time)
+            if time < cache_time_range[0]:
+                raise HTTPException(
+                    status_code=410,
+                    detail=(
+                        f"请求的时间 {time:.2f} s 已超出缓存保留范围。"
+                        f"当前缓存范围: [{cache_time_range[0]:.2f}, {cache_time_range[1]:.2f}] s "
+                        f"(保留时间: {cache_retention_time:.2f} s)"
+                    )
+                )
+        # 查找最接近的时间点
+        time_idx = find_nearest_index(times, time)
+
+    frame_json = _frame_json(
+        task,
+        float(times[time_idx]),
+        point_format,
+        lambda: build_payload(task, time_idx, point_format),
+    )
+    return _frames_response(task, simulation_id, frame_json)
 
 
 @router.get(
@@ -285,21 +450,17 @@ async def query_wave_at_point(
     
     特殊值：time=-1 表示获取最新帧的信息（最后一个可用帧）。
     """
-    import time as time_module
-    query_start = time_module.time()
-    print(f"\n[后端性能] ========== 查询开始 ==========")
-    
+    query_start = perf_counter()
+
     # 获取任务
-    step_start = time_module.time()
     task = get_simulation_task(simulation_id)
-    print(f"[后端性能] 获取任务耗时: {(time_module.time() - step_start)*1000:.2f} ms")
     if task is None:
         raise HTTPException(
             status_code=404,
             detail=f"Simulation {simulation_id} not found",
         )
 
-    has_frames = bool(task.frames)
+    has_frames = task.frame_times.size > 0
     has_wave_grid = task.wave_grid is not None and task.wave_grid.times.size > 0 if task.wave_grid is not None else False
 
     if not has_frames and not has_wave_grid:
@@ -321,7 +482,7 @@ async def query_wave_at_point(
     # 处理 time=-1：使用最新帧时间作为查询时间
     if time == -1:
         if has_frames:
-            requested_time = task.frames[-1].time
+            requested_time = float(task.frame_times[-1])
         elif has_wave_grid:
             requested_time = float(task.wave_grid.times[-1])
         else:
@@ -347,7 +508,7 @@ async def query_wave_at_point(
     if cache_retention_time is not None:
         latest_time = None
         if has_frames:
-            latest_time = task.frames[-1].time
+            latest_time = float(task.frame_times[-1])
         elif has_wave_grid:
             latest_time = float(task.wave_grid.times[-1])
         
@@ -364,42 +525,24 @@ async def query_wave_at_point(
                 )
 
     # 无时间插值：使用与请求时间最接近的单帧数据
-    step_start = time_module.time()
+    frame_layout = None
     if has_frames:
-        target_frame = _find_closest_frame(task.frames, requested_time)
-        if target_frame is None:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Simulation {simulation_id} has no valid results",
+        frame_idx = find_nearest_index(task.frame_times, requested_time)
+        actual_time = float(task.frame_times[frame_idx])
+
+        # 规则网格：直接在最近帧上读取 4 个角点插值，无需构建网格
+        frame_layout = _get_frame_layout(task)
+        if frame_layout.point_order is None:
+            # 非规则网格：使用任务上增量维护的帧网格（只处理新增帧）
+            build_start = perf_counter()
+            target_wave_grid = _get_frames_wave_grid(task)
+            logger.debug(
+                "获取帧网格耗时: %.2f ms", (perf_counter() - build_start) * 1000
             )
-        actual_time = float(target_frame.time)
-        print(f"[后端性能] 查找最近帧耗时: {(time_module.time() - step_start)*1000:.2f} ms")
-        
-        # 优化：如果缓存的最新帧网格存在且时间匹配，直接使用缓存
-        cache_check_start = time_module.time()
-        if (task.latest_frame_grid_cache is not None and 
-            len(task.latest_frame_grid_cache.times) > 0 and
-            abs(task.latest_frame_grid_cache.times[0] - actual_time) < 1e-6):
-            target_wave_grid = task.latest_frame_grid_cache
-            print(f"[后端性能] 缓存命中，耗时: {(time_module.time() - cache_check_start)*1000:.2f} ms")
-        else:
-            # 否则构建单帧网格并缓存
-            build_start = time_module.time()
-            single_wave_grid = _build_wave_grid_from_frames([target_frame], task.region)
-            build_time = time_module.time() - build_start
-            print(f"[后端性能] 构建单帧网格耗时: {build_time*1000:.2f} ms ({build_time:.3f} 秒)")
-            
-            task.latest_frame_grid_cache = single_wave_grid
-            # 持久化缓存到存储
-            storage_start = time_module.time()
-            from app.core.storage import task_storage
-            task_storage.update_task(task)
-            print(f"[后端性能] 持久化缓存耗时: {(time_module.time() - storage_start)*1000:.2f} ms")
-            target_wave_grid = single_wave_grid
     elif has_wave_grid:
         wave_grid = task.wave_grid
         times = wave_grid.times
-        time_idx = int(np.argmin(np.abs(times - requested_time)))
+        time_idx = find_nearest_index(times, requested_time)
         actual_time = float(times[time_idx])
         target_wave_grid = wave_grid
     else:
@@ -409,18 +552,28 @@ async def query_wave_at_point(
         )
 
     try:
-        interp_start = time_module.time()
-        wave_height = query_point(
-            wave_grid=target_wave_grid,
-            lon=lon,
-            lat=lat,
-            time=actual_time,
+        interp_start = perf_counter()
+        if frame_layout is not None and frame_layout.point_order is not None:
+            wave_height = query_point_from_frame(
+                task.frame_heights[frame_idx],
+                frame_layout.axis_lons,
+                frame_layout.axis_lats,
+                frame_layout.point_order,
+                lon=lon,
+                lat=lat,
+            )
+        else:
+            wave_height = query_point(
+                wave_grid=target_wave_grid,
+                lon=lon,
+                lat=lat,
+                time=actual_time,
+            )
+        logger.debug(
+            "单点查询插值耗时: %.2f ms，总耗时: %.2f ms",
+            (perf_counter() - interp_start) * 1000,
+            (perf_counter() - query_start) * 1000,
         )
-        print(f"[后端性能] 插值计算耗时: {(time_module.time() - interp_start)*1000:.2f} ms")
-        
-        total_time = time_module.time() - query_start
-        print(f"[后端性能] 查询总耗时: {total_time*1000:.2f} ms ({total_time:.3f} 秒)")
-        print(f"[后端性能] ========== 查询结束 ==========\n")
 
         return PointQueryResponse(
             simulation_id=simulation_id,
@@ -430,8 +583,7 @@ async def query_wave_at_point(
             wave_height=wave_height,
         )
     except Exception as e:
-        print(f"[后端性能] 查询失败: {e}")
-        print(f"[后端性能] ========== 查询结束 ==========\n")
+        logger.exception("单点查询失败: simulation_id=%s", simulation_id)
         raise HTTPException(
             status_code=500,
             detail=f"Query failed: {str(e)}",
@@ -454,26 +606,18 @@ async def list_simulations(
     Returns:
         包含任务列表的字典
     """
-    all_tasks = task_storage.list_tasks()
-    
-    # 如果指定了状态过滤，则过滤任务
-    if status is not None:
-        filtered_tasks = [task for task in all_tasks if task.status == status]
-    else:
-        filtered_tasks = all_tasks
-    
-    # 返回任务列表（只返回基本信息，不包括大量数据）
+    # 直接迭代存储中的任务构建返回列表（只返回基本信息，不包括大量数据），
+    # 不再先复制一份任务列表
+    simulations = [
+        {
+            "simulation_id": task.simulation_id,
+            "status": task.status,
+            "created_at": task.created_at,
+        }
+        for task in task_storage.iter_tasks(status)
+    ]
     return {
-        "total": len(all_tasks),
-        "count": len(filtered_tasks),
-        "simulations": [
-            {
-                "simulation_id": task.simulation_id,
-                "status": task.status,
-                "created_at": getattr(task, "created_at", None),
-            }
-            for task in filtered_tasks
-        ]
+        "total": len(task_storage),
+        "count": len(simulations),
+        "simulations": simulations,
     }
-
-
@@ -5,10 +5,12 @@ API 路由主文件。
 """
 
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 
 from app.api import query, simulation
 
-api_router = APIRouter()
+# 默认使用 orjson 序列化响应（C 实现，数值数组序列化更快）
+api_router = APIRouter(default_response_class=ORJSONResponse)
 
 # 挂载子路由
 api_router.include_router(simulation.router)
@@ -3,27 +3,36 @@
 """
 
 import asyncio
-from typing import Optional
+import functools
+import gc
+import logging
+from typing import Dict, Optional
 
 import numpy as np
-from fastapi import APIRouter, BackgroundTasks, Body, HTTPException, Query
+from fastapi import APIRouter, Body, HTTPException
 
+from app.core.config import settings
+from app.core.executors import get_storage_executor
 from app.core.storage import task_storage
 from app.core.task_manager import (
     create_simulation_task,
     get_simulation_task,
     update_task_status,
 )
+from app.models.frame import WaveFrame
 from app.schemas.api import (
     AreaSimulationRequest,
     AreaSimulationResponse,
 )
 from app.schemas.data import SimulationStatus
-from app.services.simulation import create_wave_grid
-from app.services.simulation_stream import simulate_area_stream
+from app.services.clock import create_tick_source
+from app.services.simulation import WAVE_HEIGHT_DTYPE
+from app.services.simulation_stream import SimulationStepper, simulate_area_stream
 
 router = APIRouter(tags=["simulation"])
 
+logger = logging.getLogger(__name__)
+
 
 def _cleanup_task_resources(task) -> None:
     """
@@ -32,42 +41,310 @@ def _cleanup_task_resources(task) -> None:
     停止仿真时需要调用此函数来回收资源，而暂停时不应该调用（暂停保留资源）。
     
     清理的内容包括：
-    - 清空帧列表（frames），可能包含大量数据
+    - 清空帧数据（帧时间与帧高度缓冲区），可能包含大量数据
     - 清空波形网格（wave_grid），可能包含大量数据
     
     Args:
         task: 模拟任务对象
     """
-    # 清空帧列表（可能包含大量数据）
-    if task.frames:
-        task.frames.clear()
+    # 清空帧数据（可能包含大量数据）
+    task.frame_lons = np.empty(0)
+    task.frame_lats = np.empty(0)
+    task.frame_times = np.empty(0)
+    task.frame_heights = np.empty((0, 0))
+    task.frame_times_buffer = np.empty(0)
+    task.frame_heights_buffer = np.empty((0, 0))
+    task.frame_buffer_end = 0
     
     # 清空波形网格（可能包含大量数据）
     task.wave_grid = None
+    task.frames_grid_cache = None
+    task.frame_layout = None
+    task.frame_json_cache.clear()
     
     # 更新任务存储
     task_storage.update_task(task)
 
 
+# 帧缓冲区的最小容量（帧数）
+_FRAME_BUFFER_MIN_CAPACITY = 16
+
+# 每追加多少帧更新一次任务存储
+_STORAGE_UPDATE_INTERVAL = 10
+
+# 生产者与消费者之间帧队列的容量
+_FRAME_QUEUE_SIZE = 4
+
+# 运行中的模拟后台任务（simulation_id -> asyncio.Task），保持强引用，任务结束时自动移除
+_stream_tasks: Dict[str, "asyncio.Task[None]"] = {}
+# 正在创建（已通过数量上限检查、后台任务尚未登记）的模拟任务数
+_pending_simulations = 0
+
+
+def _evict_frames(task, count: int) -> None:
+    """淘汰最旧的 count 帧（只移动有效区间的起点），同步丢弃对应的 JSON 缓存。"""
+    # 同步丢弃已淘汰帧的 JSON 缓存
+    if task.frame_json_cache:
+        expired_times = task.frame_times[:count].tolist()
+        for frame_json_cache in task.frame_json_cache.values():
+            for expired_time in expired_times:
+                frame_json_cache.pop(expired_time, None)
+    task.frame_times = task.frame_times[count:]
+    task.frame_heights = task.frame_heights[count:]
+
+
+def _frame_capacity(time_config) -> Optional[int]:
+    """
+    根据时间配置估算帧缓冲区的初始容量（帧数）。
+
+    配置了缓存保留时间时，有效帧数不超过保留窗口内的帧数，按其两倍预留
+    （有效区间移到缓冲区末尾后才需整体前移一次）；配置了总时长时不超过总帧数。
+    两者都未配置时无法预知，返回 None（按倍数扩容）。
+    """
+    dt = time_config.dt_backend
+    capacity = None
+    if time_config.cache_retention_time is not None:
+        capacity = 2 * (int(time_config.cache_retention_time / dt) + 8)
+    if time_config.T_total is not None and time_config.T_total > 0:
+        total_frames = int(time_config.T_total / dt) + 2
+        capacity = total_frames if capacity is None else min(capacity, total_frames)
+    if capacity is None:
+        return None
+    return max(capacity, _FRAME_BUFFER_MIN_CAPACITY)
+
+
+def _reserve_frame_buffer(task, capacity: int, n_points: int) -> None:
+    """为尚未写入帧的任务一次性分配指定容量的帧缓冲区。"""
+    task.frame_times_buffer = np.empty(capacity)
+    task.frame_heights_buffer = np.empty((capacity, n_points), dtype=WAVE_HEIGHT_DTYPE)
+    task.frame_buffer_end = 0
+
+
+def _append_frame(task, frame: WaveFrame) -> None:
+    """
+    追加一帧：帧时间与海浪高度按列（SoA）写入任务的帧缓冲区。
+
+    帧时间与帧高度分别写入按倍数扩容的缓冲区（同步扩容、共用行号），
+    task.frame_times / task.frame_heights 是其中有效区间的视图，追加为均摊 O(1)，
+    淘汰只需移动视图起点。缓冲区已写入的部分不会被改写（扩容时分配新缓冲区），
+    因此此前取得的视图（如帧网格缓存中的 times）始终有效。
+    """
+    n_frames = len(task.frame_times)
+    end = task.frame_buffer_end
+    times_buffer = task.frame_times_buffer
+    heights_buffer = task.frame_heights_buffer
+    if end == len(times_buffer):
+        # 缓冲区已满：按当前有效帧数的两倍分配新缓冲区，只拷贝有效区间
+        capacity = max(2 * (n_frames + 1), _FRAME_BUFFER_MIN_CAPACITY)
+        times_buffer = np.empty(capacity)
+        heights_buffer = np.empty(
+            (capacity, len(frame.wave_height)), dtype=WAVE_HEIGHT_DTYPE
+        )
+        if n_frames:
+            times_buffer[:n_frames] = task.frame_times
+            heights_buffer[:n_frames] = task.frame_heights
+        end = n_frames
+        task.frame_times_buffer = times_buffer
+        task.frame_heights_buffer = heights_buffer
+
+    times_buffer[end] = frame.time
+    heights_buffer[end] = frame.wave_height
+    end += 1
+    task.frame_buffer_end = end
+    task.frame_times = times_buffer[end - n_frames - 1:end]
+    task.frame_heights = heights_buffer[end - n_frames - 1:end]
+
+
+def _set_clock_paused(task, paused: bool) -> None:
+    """设置时钟暂停标志，并同步时钟运行事件以唤醒等待中的模拟循环。"""
+    task.clock_paused = paused
+    if paused:
+        task.resume_event.clear()
+    else:
+        task.resume_event.set()
+
+
+def _request_stop(task) -> None:
+    """标记停止请求，并设置停止事件以立即唤醒模拟循环（包括暂停中的循环）。"""
+    task.stop_requested = True
+    task.stop_event.set()
+    _set_clock_paused(task, False)
+
+
+async def _persist_task(task) -> None:
+    """
+    在模拟循环中更新任务存储。
+
+    阻塞型存储在共享的存储线程中写入，不阻塞事件循环；内存存储直接写入。
+    """
+    if task_storage.is_blocking:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            get_storage_executor(), task_storage.update_task, task
+        )
+    else:
+        task_storage.update_task(task)
+
+
+async def _produce_frames(
+    task,
+    stepper: SimulationStepper,
+    tick_source,
+    dt: float,
+    frame_queue: asyncio.Queue,
+) -> Optional[SimulationStatus]:
+    """
+    生产者：按节拍从步进器取出预计算帧，放入有界队列。
+
+    队列已满时 put 会等待消费者，形成背压。结束时放入 None 作为结束标记。
+    任务对象在整个模拟期间不变，控制标志通过其上的事件读取，无需反复查询存储。
+
+    Args:
+        task: 模拟任务
+        stepper: 模拟步进器
+        tick_source: 节拍源
+        dt: 时间步长（秒）
+        frame_queue: 帧队列
+
+    Returns:
+        结束时任务应进入的状态（STOPPED / COMPLETED），无需更新状态时返回 None
+    """
+    try:
+        stop_event = task.stop_event
+
+        while True:
+            # 若请求停止，立即终止（资源由调用方在消费者退出后回收）
+            if stop_event.is_set():
+                stepper.stop()
+                return SimulationStatus.STOPPED
+
+            # 如果达到时间上限（仅限配置了 T_total 的旧模式）
+            if stepper.is_completed and stepper.time_limit is not None:
+                return SimulationStatus.COMPLETED
+
+            # 若暂停，则等待恢复或停止（不清理资源，保留所有数据）
+            if task.clock_paused:
+                await task.resume_event.wait()
+                # 恢复后重新开始计时，不追赶暂停期间的时间
+                tick_source.reset()
+                continue
+
+            # 正常运行：由节拍源控制步进节奏
+            # 获取预计算的下一帧（应该已经准备好了，无延迟）
+            frame = await stepper.get_precomputed_frame()
+            
+            # 实时模式下等待到下一计划时刻，确保模拟时间与真实时间同步（1:1）；
+            # 虚拟模式下不等待，按计算速度推进。等待期间收到停止请求则立即终止
+            if await tick_source.wait(dt, stop_event):
+                stepper.stop()
+                return SimulationStatus.STOPPED
+            if task.clock_paused:
+                # 等待期间被暂停：已取出的帧保留到恢复后发布，避免帧时间出现空缺
+                await task.resume_event.wait()
+                tick_source.reset()
+                if stop_event.is_set():
+                    stepper.stop()
+                    return SimulationStatus.STOPPED
+
+            if frame is None:
+                # 达到时间上限
+                if stepper.is_completed and stepper.time_limit is not None:
+                    return SimulationStatus.COMPLETED
+                return None
+
+            await frame_queue.put(frame)
+    finally:
+        await frame_queue.put(None)
+
+
+def _append_frame_with_retention(
+    task, frame, cache_retention_time: float
+) -> None:
+    """追加一帧，并淘汰超出缓存保留时间的旧帧。"""
+    _append_frame(task, frame)
+
+    # 保留时间阈值：当前时间 - 保留时间
+    retention_threshold = frame.time - cache_retention_time
+
+    # 帧按时间升序排列，时间小于阈值的旧帧都在前部；
+    # 最旧的帧仍在保留窗口内时无需查找
+    if task.frame_times[0] < retention_threshold:
+        expired_count = int(
+            np.searchsorted(task.frame_times, retention_threshold)
+        )
+        _evict_frames(task, expired_count)
+
+
+async def _consume_frames(
+    task,
+    cache_retention_time: Optional[float],
+    frame_queue: asyncio.Queue,
+) -> None:
+    """
+    消费者：从队列取出帧，追加到任务、淘汰过期帧并更新存储。
+
+    是否淘汰旧帧、是否需要写回存储在启动时确定一次，循环内不再判断。
+
+    Args:
+        task: 模拟任务
+        cache_retention_time: 缓存保留时间（秒），None 表示不限制
+        frame_queue: 帧队列（None 为结束标记）
+    """
+    if cache_retention_time is None:
+        append_frame = _append_frame
+    else:
+        append_frame = functools.partial(
+            _append_frame_with_retention,
+            cache_retention_time=cache_retention_time,
+        )
+    stop_event = task.stop_event
+    # 存储直接持有任务对象时，追加的帧立即可见，无需写回存储
+    persist = not task_storage.holds_references
+
+    # 距上次更新存储以来追加的帧数
+    frames_since_update = 0
+
+    while True:
+        frame = await frame_queue.get()
+        if frame is None:
+            # 结束时写入尚未更新到存储的帧
+            if frames_since_update > 0 and not stop_event.is_set():
+                await _persist_task(task)
+            return
+
+        if stop_event.is_set():
+            # 任务即将停止回收，不再存储新帧
+            continue
+
+        # 存储帧到任务中（配置了缓存保留时间时同时清理过期的旧帧）
+        append_frame(task, frame)
+
+        if not persist:
+            continue
+
+        # 批量更新存储：每隔若干帧更新一次（淘汰帧也随之一并写入）；
+        # 暂停、恢复、停止等状态变化由对应接口立即写入
+        frames_since_update += 1
+        if frames_since_update >= _STORAGE_UPDATE_INTERVAL:
+            await _persist_task(task)
+            frames_since_update = 0
+
+
 async def _run_simulation_stream(
     simulation_id: str,
-    region,
-    wind_config,
-    spectrum_config,
-    discretization_config,
+    stepper: SimulationStepper,
     time_config,
 ) -> None:
     """
     后台任务：使用外部时钟控制模拟步进，按时钟间隔计算并存储帧。
     
     使用外部时钟（定时器）定期调用 step() 方法，每次调用代表过了一个时间步长（dt_backend）。
+    帧的获取（生产者）与存储、淘汰（消费者）分为两个协程，通过有界队列衔接，
+    存储侧的处理不会推迟下一帧的获取。
     
     Args:
         simulation_id: 模拟任务ID
-        region: 区域配置
-        wind_config: 风场配置
-        spectrum_config: 波浪谱配置
-        discretization_config: 离散化配置
+        stepper: 已初始化的模拟步进器
         time_config: 时间配置
     """
     try:
@@ -77,118 +354,104 @@ async def _run_simulation_stream(
         if task is None:
             return
 
-        # 创建模拟步进器
-        stepper = await simulate_area_stream(
-            region=region,
-            wind_config=wind_config,
-            spectrum_config=spectrum_config,
-            discretization_config=discretization_config,
-            time_config=time_config,
-        )
-
         # 获取时间步长（秒）
         dt = time_config.dt_backend
         # 获取缓存保留时间（秒），None 表示不限制
         cache_retention_time = time_config.cache_retention_time
-
-        # 首次调用获取初始帧（t=0）
+        # 节拍源：实时或虚拟时钟
+        tick_source = create_tick_source(time_config)
+
+        # 各帧共享的网格点坐标（帧只保存海浪高度）
+        task.frame_lons = stepper.point_lons
+        task.frame_lats = stepper.point_lats
+        # 帧数上限可由配置确定时，预先分配帧缓冲区，避免运行中逐步扩容拷贝
+        frame_capacity = _frame_capacity(time_config)
+        if frame_capacity is not None:
+            _reserve_frame_buffer(task, frame_capacity, len(stepper.point_lons))
+
+        # 首次调用获取初始帧（t=0）：t=0 海浪场已在步进器初始化时于计算线程池中算好，
+        # 这里只是取出，无需再交给执行器；后续各帧均由后台预计算在计算线程池中完成
         frame = stepper.step()
         if frame is not None:
-            task.frames.append(frame)
-            task_storage.update_task(task)
-            
-            # 立即开始预计算第一个时间步（t=dt），实现流水线计算
+            # 先启动后续时间步（t=dt 起）的预计算，使其与初始帧的存储重叠
             await stepper.precompute_next_frame(loop)
 
-        # 定时器循环：根据控制状态持续运行
-        while True:
-            task = get_simulation_task(simulation_id)
-            if task is None:
-                break
+            _append_frame(task, frame)
+            if not task_storage.holds_references:
+                await _persist_task(task)
 
-            # 若请求停止，立即终止并回收资源
-            if task.stop_requested:
-                stepper.stop()
-                # 回收资源：清理任务数据
-                _cleanup_task_resources(task)
-                update_task_status(simulation_id, SimulationStatus.STOPPED)
-                break
+        # 生产者/消费者流水线
+        frame_queue: asyncio.Queue = asyncio.Queue(maxsize=_FRAME_QUEUE_SIZE)
+        producer = asyncio.ensure_future(
+            _produce_frames(task, stepper, tick_source, dt, frame_queue)
+        )
+        consumer = asyncio.ensure_future(
+            _consume_frames(task, cache_retention_time, frame_queue)
+        )
+        try:
+            final_status, _ = await asyncio.gather(producer, consumer)
+        except BaseException:
+            producer.cancel()
+            consumer.cancel()
+            # 被取消（如应用关闭）时停止步进器，结束后台预计算
+            stepper.stop()
+            raise
+
+        # 任务对象在启动时获取一次，结束时直接更新其状态，不再按 ID 重新查找
+        if final_status == SimulationStatus.STOPPED:
+            # 回收资源：清理任务数据，并回收其中可能存在的循环引用
+            _cleanup_task_resources(task)
+            task_storage.set_task_status(task, SimulationStatus.STOPPED)
+            gc.collect(1)
+        elif final_status == SimulationStatus.COMPLETED:
+            task_storage.set_task_status(task, SimulationStatus.COMPLETED)
 
-            # 如果达到时间上限（仅限配置了 T_total 的旧模式）
-            if stepper.is_completed and stepper.time_limit is not None:
-                update_task_status(simulation_id, SimulationStatus.COMPLETED)
-                break
+    except Exception:
+        # 如果出错，更新状态为失败
+        update_task_status(simulation_id, SimulationStatus.FAILED)
+        logger.exception(f"Simulation stream error for {simulation_id}")
+    finally:
+        # 模拟循环已结束，释放步进器持有的海浪场等数据（帧数据已复制到任务的帧缓冲区）
+        stepper.release()
 
-            # 若暂停，则短暂休眠后继续检查（不清理资源，保留所有数据）
-            if task.clock_paused:
-                await asyncio.sleep(0.1)
-                continue
 
-            # 正常运行：使用真实时间控制，确保模拟时间与真实时间同步
-            # 记录开始时间
-            step_start_time = loop.time()
-            
-            # 获取预计算的下一帧（应该已经准备好了，无延迟）
-            frame = await stepper.get_precomputed_frame()
-            
-            # 计算实际耗时（获取预计算帧的耗时应该很短）
-            step_elapsed = loop.time() - step_start_time
-            
-            # 如果获取预计算帧的时间小于 dt，则等待剩余时间；如果超过 dt，则不等待
-            # 这样可以确保模拟时间与真实时间同步（1:1）
-            if step_elapsed < dt:
-                await asyncio.sleep(dt - step_elapsed)
-            
-            # 再次检查任务状态（避免等待期间状态变化）
-            task = get_simulation_task(simulation_id)
-            if task is None:
-                break
-            if task.stop_requested:
-                stepper.stop()
-                # 回收资源：清理任务数据
-                _cleanup_task_resources(task)
-                update_task_status(simulation_id, SimulationStatus.STOPPED)
-                break
-            if task.clock_paused:
-                # 暂停时不清理资源，只暂停时钟，保留所有数据
-                continue
+def _start_stream_task(simulation_id: str, coro) -> None:
+    """
+    启动模拟后台任务并登记到任务表（保持引用，避免任务被回收）。
 
-            if frame is None:
-                # 可能是达到时间上限或收到停止指令
-                if task.stop_requested:
-                    stepper.stop()
-                    # 回收资源：清理任务数据
-                    _cleanup_task_resources(task)
-                    update_task_status(simulation_id, SimulationStatus.STOPPED)
-                elif stepper.is_completed and stepper.time_limit is not None:
-                    update_task_status(simulation_id, SimulationStatus.COMPLETED)
-                break
-
-            # 存储帧到任务中
-            task.frames.append(frame)
-            
-            # 如果配置了缓存保留时间，清理过期的旧帧
-            if cache_retention_time is not None and len(task.frames) > 0:
-                current_time = frame.time
-                # 保留时间阈值：当前时间 - 保留时间
-                retention_threshold = current_time - cache_retention_time
-                
-                # 过滤掉时间小于阈值的旧帧（保留时间阈值之后的所有帧）
-                original_count = len(task.frames)
-                task.frames = [f for f in task.frames if f.time >= retention_threshold]
-                
-                # 如果清理了帧，更新存储
-                if len(task.frames) < original_count:
-                    task_storage.update_task(task)
-            else:
-                # 如果没有配置缓存保留时间，直接更新
-                task_storage.update_task(task)
+    任务结束时从任务表移除；若以未处理的异常结束（模拟循环自身未能捕获），
+    记录日志、将模拟任务标记为失败并清理其资源。
+    """
+    stream_task = asyncio.create_task(coro)
+    _stream_tasks[simulation_id] = stream_task
 
-    except Exception as e:
-        # 如果出错，更新状态为失败
-        update_task_status(simulation_id, SimulationStatus.FAILED)
-        # 可以在这里添加日志记录
-        print(f"Simulation stream error for {simulation_id}: {e}")
+    def _on_done(done_task) -> None:
+        if _stream_tasks.get(simulation_id) is done_task:
+            del _stream_tasks[simulation_id]
+        if done_task.cancelled():
+            return
+        exc = done_task.exception()
+        if exc is None:
+            return
+        logger.error(
+            f"Simulation stream for {simulation_id} exited with an unhandled error",
+            exc_info=exc,
+        )
+        task = get_simulation_task(simulation_id)
+        if task is not None:
+            _cleanup_task_resources(task)
+            task_storage.set_task_status(task, SimulationStatus.FAILED)
+
+    stream_task.add_done_callback(_on_done)
+
+
+async def cancel_stream_tasks() -> None:
+    """取消所有运行中的模拟后台任务并等待其退出（应用关闭时调用）。"""
+    stream_tasks = list(_stream_tasks.values())
+    for stream_task in stream_tasks:
+        stream_task.cancel()
+    if stream_tasks:
+        await asyncio.gather(*stream_tasks, return_exceptions=True)
 
 
 @router.post(
@@ -234,6 +497,7 @@ async def create_area_simulation(
                         "dt_backend": 0.2,
                         "T_total": None,
                         "cache_retention_time": None,
+                        "realtime": True,
                     },
                 },
             },
@@ -245,7 +509,26 @@ async def create_area_simulation(
 
     根据输入的区域、风场参数、波浪谱参数以及离散化和时间设置，
     创建一次区域海浪模拟任务。返回 simulation_id，用于后续查询模拟结果。
+
+    配置了同时运行的模拟任务数上限（MAX_SIMULATIONS）且已达到上限时返回 503。
     """
+    global _pending_simulations
+    # 后台任务表即运行中（含暂停中）的模拟，加上正在创建的模拟，达到上限时拒绝创建，避免无限占用计算资源
+    if (
+        settings.max_simulations > 0
+        and len(_stream_tasks) + _pending_simulations >= settings.max_simulations
+    ):
+        raise HTTPException(
+            status_code=503,
+            detail=(
+                f"Too many running simulations (limit {settings.max_simulations}). "
+                f"Stop an existing simulation and try again."
+            ),
+        )
+
+    # 在第一次 await 之前占用名额：检查与占用在同一段同步代码中，并发的创建请求不会同时通过检查；
+    # 后台任务登记到任务表（或创建失败）后释放
+    _pending_simulations += 1
     try:
         # 创建任务
         simulation_id = create_simulation_task(
@@ -266,17 +549,24 @@ async def create_area_simulation(
                 status_code=500, detail="Failed to create simulation task"
             )
 
+        # 创建模拟步进器（初始化计算在线程池中执行，不阻塞事件循环）
+        stepper = await simulate_area_stream(
+            region=request.region,
+            wind_config=request.wind,
+            spectrum_config=request.spectrum,
+            discretization_config=request.discretization,
+            time_config=request.time,
+        )
+
         # 启动后台任务，使用异步流式模拟按时钟间隔计算并存储帧
         # 使用 asyncio.create_task 替代 BackgroundTasks，避免阻塞响应（特别是对于无限运行的任务）
-        asyncio.create_task(
+        _start_stream_task(
+            simulation_id,
             _run_simulation_stream(
                 simulation_id=simulation_id,
-                region=request.region,
-                wind_config=request.wind,
-                spectrum_config=request.spectrum,
-                discretization_config=request.discretization,
+                stepper=stepper,
                 time_config=request.time,
-            )
+            ),
         )
 
         # 返回运行中状态，因为任务正在后台执行
@@ -293,6 +583,8 @@ async def create_area_simulation(
             status_code=500,
             detail=f"Simulation failed: {str(e)}",
         )
+    finally:
+        _pending_simulations -= 1
 
 
 def _ensure_task_for_control(simulation_id: str):
@@ -331,7 +623,7 @@ async def pause_simulation_clock(simulation_id: str) -> AreaSimulationResponse:
         )
 
     if not task.clock_paused:
-        task.clock_paused = True
+        _set_clock_paused(task, True)
         task_storage.update_task(task)
         update_task_status(simulation_id, SimulationStatus.PAUSED)
 
@@ -367,7 +659,7 @@ async def resume_simulation_clock(simulation_id: str) -> AreaSimulationResponse:
         )
 
     if task.clock_paused:
-        task.clock_paused = False
+        _set_clock_paused(task, False)
         task_storage.update_task(task)
         update_task_status(simulation_id, SimulationStatus.RUNNING)
 
@@ -407,8 +699,7 @@ async def stop_simulation(simulation_id: str) -> AreaSimulationResponse:
         )
 
     # 标记停止请求
-    task.stop_requested = True
-    task.clock_paused = False
+    _request_stop(task)
     task_storage.update_task(task)
     
     # 注意：实际的资源清理会在后台任务循环中执行
@@ -420,6 +711,13 @@ async def stop_simulation(simulation_id: str) -> AreaSimulationResponse:
     )
 
 
+async def _stop_one(task) -> None:
+    """请求停止单个任务并写入存储。"""
+    _request_stop(task)
+    await _persist_task(task)
+    update_task_status(task.simulation_id, SimulationStatus.STOPPED)
+
+
 @router.post(
     "/simulations/stop-all",
     summary="停止所有运行中的仿真任务",
@@ -431,27 +729,26 @@ async def stop_all_simulations() -> dict:
     Returns:
         包含停止结果统计的字典
     """
-    all_tasks = task_storage.list_tasks()
-    
-    # 过滤出运行中的任务（RUNNING 或 PENDING）
-    running_tasks = [
-        task for task in all_tasks
-        if task.status in (SimulationStatus.RUNNING, SimulationStatus.PENDING)
-    ]
-    
+    # 运行中的任务（RUNNING 或 PENDING），通过状态索引获取，无需遍历全部任务
+    running_tasks = task_storage.list_tasks(
+        SimulationStatus.RUNNING
+    ) + task_storage.list_tasks(SimulationStatus.PENDING)
+
+    # 并发停止各任务（阻塞型存储的写入在存储线程中执行，互不等待）
+    results = await asyncio.gather(
+        *(_stop_one(task) for task in running_tasks), return_exceptions=True
+    )
     stopped_count = 0
-    for task in running_tasks:
-        try:
-            task.stop_requested = True
-            task.clock_paused = False
-            task_storage.update_task(task)
-            update_task_status(task.simulation_id, SimulationStatus.STOPPED)
+    for task, result in zip(running_tasks, results):
+        if isinstance(result, BaseException):
+            logger.error(
+                f"Error stopping task {task.simulation_id}", exc_info=result
+            )
+        else:
             stopped_count += 1
-        except Exception as e:
-            print(f"Error stopping task {task.simulation_id}: {e}")
     
     return {
-        "total_tasks": len(all_tasks),
+        "total_tasks": len(task_storage),
         "running_tasks": len(running_tasks),
         "stopped_count": stopped_count,
         "message": f"Stopped {stopped_count} running simulation(s)"
@@ -15,9 +15,16 @@ except ImportError:
 
 
 class Settings(BaseSettings):
-    """应用配置（仅结构占位，具体字段后续补充）。"""
+    """应用配置（可通过同名环境变量覆盖）。"""
 
     app_name: str = "WaveEnv Backend"
+    # 海浪场计算进程池大小：0 表示在线程中计算；大于 0 时在独立进程中计算，
+    # 多个模拟任务并发时可利用多核、不受 GIL 限制
+    compute_processes: int = 0
+    # 同时运行的模拟任务数上限：0 表示不限制；达到上限时拒绝创建新的模拟任务
+    max_simulations: int = 0
+    # 是否使用 GPU（CuPy）计算海浪场：需安装 cupy 且有可用的 CUDA 设备，网格较大时才生效
+    use_gpu: bool = False
 
 
 settings = Settings()
@@ -0,0 +1,77 @@
+"""
+共享执行器。
+
+后台线程池与计算进程池在进程内共享，避免每个模拟任务各自创建线程或进程。
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from app.core.config import settings
+
+_storage_executor: Optional[ThreadPoolExecutor] = None
+_compute_executor: Optional[ThreadPoolExecutor] = None
+_compute_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_storage_executor() -> ThreadPoolExecutor:
+    """
+    获取任务存储写入执行器。
+
+    只使用单个线程，保证同一任务的多次写入按提交顺序执行。
+    """
+    global _storage_executor
+    if _storage_executor is None:
+        _storage_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="task-storage"
+        )
+    return _storage_executor
+
+
+def get_compute_executor() -> ThreadPoolExecutor:
+    """
+    获取海浪场计算线程池。
+
+    所有模拟任务共用，与默认执行器（FastAPI 同步接口等使用）隔离，
+    计算负载高时不会挤占请求处理的线程。
+    """
+    global _compute_executor
+    if _compute_executor is None:
+        _compute_executor = ThreadPoolExecutor(
+            max_workers=os.cpu_count() or 1, thread_name_prefix="wave-compute"
+        )
+    return _compute_executor
+
+
+def get_compute_process_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    获取海浪场计算进程池。
+
+    进程数由 settings.compute_processes 配置，为 0 时返回 None（在线程中计算）。
+    使用 spawn 方式创建子进程，避免 fork 复制事件循环与线程状态。
+    """
+    global _compute_process_pool
+    if settings.compute_processes <= 0:
+        return None
+    if _compute_process_pool is None:
+        _compute_process_pool = ProcessPoolExecutor(
+            max_workers=settings.compute_processes,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _compute_process_pool
+
+
+def shutdown_executors() -> None:
+    """关闭共享执行器（应用退出时调用）。"""
+    global _storage_executor, _compute_executor, _compute_process_pool
+    if _storage_executor is not None:
+        _storage_executor.shutdown(wait=True)
+        _storage_executor = None
+    if _compute_executor is not None:
+        _compute_executor.shutdown(wait=True)
+        _compute_executor = None
+    if _compute_process_pool is not None:
+        _compute_process_pool.shutdown(wait=True)
+        _compute_process_pool = None
@@ -0,0 +1,51 @@
+"""
+日志配置。
+
+应用日志（app.* 记录器）经 QueueHandler 写入队列，由独立线程中的 QueueListener 输出，
+事件循环中记录日志只是入队操作，不会因同步写 stdout 而阻塞。
+"""
+
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+def setup_logging(level: int = logging.INFO) -> None:
+    """配置应用日志并启动后台输出线程（重复调用无副作用）。"""
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    _queue_handler = QueueHandler(log_queue)
+    app_logger = logging.getLogger("app")
+    app_logger.addHandler(_queue_handler)
+    app_logger.setLevel(level)
+    # 不再向根记录器传播，避免其他处理器在事件循环中同步输出
+    app_logger.propagate = False
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """停止后台输出线程（输出队列中剩余的日志），恢复默认日志行为。"""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+
+    _listener.stop()
+    app_logger = logging.getLogger("app")
+    app_logger.removeHandler(_queue_handler)
+    app_logger.propagate = True
+    _listener = None
+    _queue_handler = None
@@ -4,38 +4,114 @@
 使用内存存储模拟任务（后续可扩展为数据库）。
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Set
 
 from app.models.simulation import SimulationTask
+from app.schemas.data import SimulationStatus
 
 
 class TaskStorage:
     """任务存储（内存）。"""
 
+    # 写入是否为阻塞操作（如数据库、磁盘）。为 True 时模拟循环在线程池中写入，
+    # 内存存储的写入只是字典赋值，直接在事件循环中执行。
+    is_blocking: bool = False
+
+    # 存储是否直接持有任务对象。为 True 时对任务对象的修改立即可见，
+    # 模拟循环中追加帧后无需再写回存储。
+    holds_references: bool = True
+
     def __init__(self):
         self._tasks: Dict[str, SimulationTask] = {}
+        # 按状态索引的任务 ID 集合，按状态过滤时只需遍历匹配的任务
+        self._by_status: Dict[SimulationStatus, Set[str]] = {}
+        # 任务 ID -> 当前索引所在的状态
+        self._indexed_status: Dict[str, SimulationStatus] = {}
+
+    def __len__(self) -> int:
+        """任务总数。"""
+        return len(self._tasks)
+
+    def _index_status(self, task: SimulationTask) -> None:
+        """将任务 ID 移动到其当前状态对应的索引集合中。"""
+        simulation_id = task.simulation_id
+        old_status = self._indexed_status.get(simulation_id)
+        if old_status == task.status:
+            return
+        if old_status is not None:
+            self._by_status[old_status].discard(simulation_id)
+        self._by_status.setdefault(task.status, set()).add(simulation_id)
+        self._indexed_status[simulation_id] = task.status
+
+    def _unindex_status(self, simulation_id: str) -> None:
+        """从状态索引中移除任务 ID。"""
+        old_status = self._indexed_status.pop(simulation_id, None)
+        if old_status is not None:
+            self._by_status[old_status].discard(simulation_id)
 
     def add_task(self, task: SimulationTask) -> None:
         """添加任务。"""
         self._tasks[task.simulation_id] = task
+        self._index_status(task)
 
     def get_task(self, simulation_id: str) -> Optional[SimulationTask]:
         """获取任务。"""
         return self._tasks.get(simulation_id)
 
     def update_task(self, task: SimulationTask) -> None:
-        """更新任务。"""
-        if task.simulation_id in self._tasks:
+        """更新任务（存储中已是同一对象时只同步状态索引）。"""
+        stored = self._tasks.get(task.simulation_id)
+        if stored is None:
+            return
+        if stored is not task:
             self._tasks[task.simulation_id] = task
+        self._index_status(task)
+
+    def set_task_status(self, task: SimulationTask, status: SimulationStatus) -> None:
+        """更新任务状态并同步状态索引。"""
+        task.status = status
+        if task.simulation_id in self._tasks:
+            self._index_status(task)
 
     def remove_task(self, simulation_id: str) -> None:
         """删除任务。"""
         if simulation_id in self._tasks:
             del self._tasks[simulation_id]
+            self._unindex_status(simulation_id)
+
+    def iter_tasks(
+        self, status: Optional[SimulationStatus] = None
+    ) -> Iterator[SimulationTask]:
+        """
+        逐个迭代任务，不复制任务列表。
+
+        迭代期间不能增删任务（调用方应在不让出事件循环的情况下一次迭代完），
+        需要跨 await 使用时请使用 list_tasks 获取快照。
+
+        Args:
+            status: 可选的状态过滤器，只迭代指定状态的任务
+
+        Returns:
+            任务迭代器
+        """
+        if status is None:
+            return iter(self._tasks.values())
+        tasks = self._tasks
+        return (tasks[simulation_id] for simulation_id in self._by_status.get(status, ()))
+
+    def list_tasks(
+        self, status: Optional[SimulationStatus] = None
+    ) -> List[SimulationTask]:
+        """
+        列出任务（快照）。
+
+        Args:
+            status: 可选的状态过滤器，只返回指定状态的任务
 
-    def list_tasks(self) -> List[SimulationTask]:
-        """列出所有任务。"""
-        return list(self._tasks.values())
+        Returns:
+            任务列表
+        """
+        return list(self.iter_tasks(status))
 
 
 # 全局任务存储实例
@@ -86,7 +86,6 @@ def update_task_status(
     if task is None:
         return False
 
-    task.status = status
-    task_storage.update_task(task)
+    task_storage.set_task_status(task, status)
     return True
 
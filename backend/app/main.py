@@ -2,17 +2,25 @@
 FastAPI 应用入口。
 """
 
-import asyncio
 import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api import api_router
-from app.api.simulation import _cleanup_task_resources
+from app.api.simulation import (
+    _cleanup_task_resources,
+    _request_stop,
+    cancel_stream_tasks,
+)
+from app.core.executors import shutdown_executors
+from app.core.log import setup_logging, shutdown_logging
 from app.core.storage import task_storage
 from app.schemas.data import SimulationStatus
+from app.services.interpolation import warmup_interpolation
+from app.services.simulation import warmup_wave_field
 
 logger = logging.getLogger(__name__)
 
@@ -25,28 +33,28 @@ async def lifespan(app: FastAPI):
     处理应用启动和关闭事件。
     """
     # 启动时的逻辑（如果需要）
+    setup_logging()
     logger.info("Starting backend server...")
+    # 预编译 JIT 数值内核（未安装 numba 时为空操作）
+    warmup_interpolation()
+    warmup_wave_field()
     
     yield
     
     # 关闭时的逻辑
     logger.info("Shutting down backend server...")
     
-    # 获取所有任务
-    all_tasks = task_storage.list_tasks()
-    
-    # 停止所有运行中的任务
-    running_tasks = [
-        task for task in all_tasks 
-        if task.status in (SimulationStatus.RUNNING, SimulationStatus.PENDING)
-    ]
+    # 停止所有运行中的任务（通过状态索引获取，无需遍历全部任务）
+    running_tasks = task_storage.list_tasks(
+        SimulationStatus.RUNNING
+    ) + task_storage.list_tasks(SimulationStatus.PENDING)
     
     if running_tasks:
         logger.info(f"Stopping {len(running_tasks)} running simulation tasks...")
         for task in running_tasks:
             try:
                 # 标记任务为停止请求
-                task.stop_requested = True
+                _request_stop(task)
                 task_storage.update_task(task)
                 # 立即清理资源，释放内存
                 _cleanup_task_resources(task)
@@ -54,10 +62,14 @@ async def lifespan(app: FastAPI):
             except Exception as e:
                 logger.error(f"Error stopping task {task.simulation_id}: {e}")
         
-        # 等待一小段时间，让任务循环有机会退出
-        await asyncio.sleep(0.5)
-    
+    # 取消仍在运行的模拟后台任务（包括暂停中的任务），并等待其退出
+    await cancel_stream_tasks()
+
+    # 关闭共享执行器
+    shutdown_executors()
+
     logger.info("Backend server shutdown complete.")
+    shutdown_logging()
 
 
 def create_app() -> FastAPI:
@@ -67,6 +79,8 @@ def create_app() -> FastAPI:
         version="0.1.0",
         description="时变海浪环境模型后端服务",
         lifespan=lifespan,
+        # 响应统一由 orjson 序列化（比标准库 json 快，且直接支持 numpy 数组）
+        default_response_class=ORJSONResponse,
     )
 
     # 配置 CORS
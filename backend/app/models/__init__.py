@@ -4,7 +4,8 @@
 包含网格、任务、风场、波浪谱等内部数据结构。
 """
 
-from app.models.grid import GridPoint, WaveGrid
+from app.models.frame import WaveFrame
+from app.models.grid import FrameLayout, GridPoint, WaveGrid
 from app.models.simulation import SimulationTask
 from app.models.spectrum import WaveComponent, WaveSpectrum
 from app.models.wind import WindField
@@ -12,6 +13,8 @@ from app.models.wind import WindField
 __all__ = [
     "GridPoint",
     "WaveGrid",
+    "FrameLayout",
+    "WaveFrame",
     "WindField",
     "WaveComponent",
     "WaveSpectrum",
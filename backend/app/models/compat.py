@@ -0,0 +1,16 @@
+"""
+数据类兼容性支持。
+
+dataclass 的 slots 参数需要 Python 3.10+：
+- 3.10 及以上版本中，DATACLASS_SLOTS 为 {"slots": True}，实例不再携带 __dict__，
+  占用更少内存、属性访问更快；
+- 更早的版本中为空字典，数据类行为不变。
+
+用法：@dataclass(**DATACLASS_SLOTS)
+"""
+
+import sys
+
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+__all__ = ["DATACLASS_SLOTS"]
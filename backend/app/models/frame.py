@@ -0,0 +1,22 @@
+"""
+模拟帧模型定义。
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.models.compat import DATACLASS_SLOTS
+
+
+@dataclass(**DATACLASS_SLOTS)
+class WaveFrame:
+    """
+    单个时间步的海浪场（内部表示）。
+
+    只保存海浪高度数组，网格点坐标由同一任务的所有帧共享，
+    只在 HTTP 响应时才转换为 SimulationFrame / WavePoint 结构。
+    """
+
+    time: float  # 时间（秒）
+    wave_height: np.ndarray  # 各网格点海浪高度，shape: (n_points,)
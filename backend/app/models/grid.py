@@ -5,12 +5,15 @@
 """
 
 from dataclasses import dataclass
-from typing import List
+from functools import cached_property
+from typing import List, Optional, Tuple
 
 import numpy as np
 
+from app.models.compat import DATACLASS_SLOTS
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class GridPoint:
     """网格点数据。"""
 
@@ -31,11 +34,91 @@ class WaveGrid:
 
     def get_height_at_time(self, time: float) -> np.ndarray:
         """获取指定时刻的海浪高度。"""
-        # 找到最接近的时间索引
-        idx = np.argmin(np.abs(self.times - time))
+        from app.utils.numerical import find_nearest_index
+
+        # 时间数组升序，二分查找最接近的时间索引（不分配临时数组）
+        idx = find_nearest_index(self.times, time)
         return self.wave_heights[idx]
 
     def get_height_at_point(self, point_idx: int) -> np.ndarray:
         """获取指定点的海浪高度时间序列。"""
         return self.wave_heights[:, point_idx]
 
+    @cached_property
+    def point_lons(self) -> np.ndarray:
+        """各网格点的经度（SoA 数组）。"""
+        return np.array([p.lon for p in self.grid_points], dtype=np.float64)
+
+    @cached_property
+    def point_lats(self) -> np.ndarray:
+        """各网格点的纬度（SoA 数组）。"""
+        return np.array([p.lat for p in self.grid_points], dtype=np.float64)
+
+    @cached_property
+    def point_xs(self) -> np.ndarray:
+        """各网格点的本地 x 坐标（SoA 数组）。"""
+        return np.array([p.x for p in self.grid_points], dtype=np.float64)
+
+    @cached_property
+    def point_ys(self) -> np.ndarray:
+        """各网格点的本地 y 坐标（SoA 数组）。"""
+        return np.array([p.y for p in self.grid_points], dtype=np.float64)
+
+    @cached_property
+    def origin(self) -> Tuple[float, float]:
+        """网格点中心（经纬度均值）(origin_lon, origin_lat)，非规则网格插值时用作本地坐标原点。"""
+        return float(self.point_lons.mean()), float(self.point_lats.mean())
+
+    @cached_property
+    def axis_lons(self) -> np.ndarray:
+        """经度轴（升序唯一值）。"""
+        return np.unique(self.point_lons)
+
+    @cached_property
+    def axis_lats(self) -> np.ndarray:
+        """纬度轴（升序唯一值）。"""
+        return np.unique(self.point_lats)
+
+    @cached_property
+    def regular_shape(self) -> Optional[Tuple[int, int]]:
+        """
+        规则网格的 (n_lat, n_lon)。
+
+        仅当网格点按 lat 为外层、lon 为内层排列成规则矩形网格时有值，否则为 None。
+        """
+        n_lon = len(self.axis_lons)
+        n_lat = len(self.axis_lats)
+        if n_lon * n_lat != len(self.grid_points):
+            return None
+
+        if not (
+            np.array_equal(self.point_lons, np.tile(self.axis_lons, n_lat))
+            and np.array_equal(self.point_lats, np.repeat(self.axis_lats, n_lon))
+        ):
+            return None
+        return n_lat, n_lon
+
+    @property
+    def heights_3d(self) -> Optional[np.ndarray]:
+        """按 (n_times, n_lat, n_lon) 排列的海浪高度（C 连续），非规则网格时为 None。
+
+        float32 高度保持原精度（不整体拷贝转换），其余类型转为 float64。
+        """
+        shape = self.regular_shape
+        if shape is None:
+            return None
+        wave_heights = self.wave_heights
+        dtype = np.float32 if wave_heights.dtype == np.float32 else np.float64
+        return np.ascontiguousarray(wave_heights, dtype=dtype).reshape(
+            len(self.times), *shape
+        )
+
+
+@dataclass
+class FrameLayout:
+    """帧的网格布局（同一任务的所有帧点顺序一致，共享同一布局）。"""
+
+    axis_lons: np.ndarray  # 经度轴（升序唯一值），shape: (n_lon,)
+    axis_lats: np.ndarray  # 纬度轴（升序唯一值），shape: (n_lat,)
+    grid_index: np.ndarray  # 帧内点序号 -> 网格点序号（lat 为外层、lon 为内层）
+    point_order: Optional[np.ndarray]  # 网格点序号 -> 帧内点序号；帧的点不构成规则网格时为 None
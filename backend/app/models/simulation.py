@@ -2,11 +2,16 @@
 模拟任务模型定义。
 """
 
+import asyncio
+import time
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Dict, Optional
 from uuid import UUID
 
-from app.models.grid import WaveGrid
+import numpy as np
+
+from app.models.compat import DATACLASS_SLOTS
+from app.models.grid import FrameLayout, WaveGrid
 from app.schemas.base import (
     DiscretizationConfig,
     Region,
@@ -14,10 +19,17 @@ from app.schemas.base import (
     TimeConfig,
     WindConfig,
 )
-from app.schemas.data import SimulationFrame, SimulationStatus
+from app.schemas.data import SimulationStatus
+
 
+def _set_event() -> asyncio.Event:
+    """创建初始为已设置状态的事件。"""
+    event = asyncio.Event()
+    event.set()
+    return event
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class SimulationTask:
     """模拟任务。"""
 
@@ -29,8 +41,18 @@ class SimulationTask:
     discretization_config: DiscretizationConfig  # 离散化配置
     time_config: TimeConfig  # 时间配置
     wave_grid: Optional[WaveGrid] = None  # 模拟结果（网格数据，用于向后兼容）
-    frames: List[SimulationFrame] = field(default_factory=list)  # 流式帧列表（异步计算）
+    frame_lons: np.ndarray = field(default_factory=lambda: np.empty(0))  # 帧网格点经度（所有帧共享）
+    frame_lats: np.ndarray = field(default_factory=lambda: np.empty(0))  # 帧网格点纬度（所有帧共享）
+    frame_times: np.ndarray = field(default_factory=lambda: np.empty(0))  # 帧时间数组（升序；frame_times_buffer 的视图）
+    frame_heights: np.ndarray = field(default_factory=lambda: np.empty((0, 0)))  # 帧高度数组 (n_frames, n_points)，与 frame_times 逐行对应（frame_heights_buffer 的视图）
+    frame_times_buffer: np.ndarray = field(default_factory=lambda: np.empty(0))  # 帧时间缓冲区（按倍数扩容）
+    frame_heights_buffer: np.ndarray = field(default_factory=lambda: np.empty((0, 0)))  # 帧高度缓冲区（与帧时间缓冲区同步扩容）
+    frame_buffer_end: int = 0  # 缓冲区中最后一个有效帧之后的行号
     clock_paused: bool = False  # 是否暂停外部时钟
+    resume_event: asyncio.Event = field(default_factory=_set_event)  # 时钟运行事件（暂停时清除，恢复或停止时设置）
     stop_requested: bool = False  # 是否请求停止模拟
-    latest_frame_grid_cache: Optional[WaveGrid] = None  # 最新帧的WaveGrid缓存（用于快速查询）
-
+    stop_event: asyncio.Event = field(default_factory=asyncio.Event)  # 停止事件（请求停止时设置，用于立即唤醒模拟循环）
+    frames_grid_cache: Optional[WaveGrid] = None  # 帧序列的WaveGrid缓存（增量更新，用于单点查询）
+    frame_layout: Optional[FrameLayout] = None  # 帧的网格布局缓存（根据第一帧计算一次）
+    frame_json_cache: Dict[str, Dict[float, bytes]] = field(default_factory=dict)  # 帧 JSON 序列化缓存（按点格式、帧时间索引）
+    created_at: float = field(default_factory=time.time)  # 创建时间（Unix 时间戳，秒）
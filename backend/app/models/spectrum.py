@@ -2,13 +2,17 @@
 波浪谱模型定义。
 """
 
+import math
 from dataclasses import dataclass
+from functools import cached_property
 from typing import List
 
 import numpy as np
 
+from app.models.compat import DATACLASS_SLOTS
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class WaveComponent:
     """单个波成分。"""
 
@@ -28,3 +32,31 @@ class WaveSpectrum:
     Tp: float  # 峰值周期（s）
     main_direction_deg: float  # 主浪向（度）
 
+    # 以下为各波成分参数的 SoA 数组（shape: (n_components,)），首次访问时由 components 计算一次；
+    # 波浪谱生成后 components 不再修改
+
+    @cached_property
+    def amplitudes(self) -> np.ndarray:
+        """各波成分振幅（米）。"""
+        return np.array([c.amplitude for c in self.components], dtype=np.float64)
+
+    @cached_property
+    def phases(self) -> np.ndarray:
+        """各波成分初始相位（弧度）。"""
+        return np.array([c.phase for c in self.components], dtype=np.float64)
+
+    @cached_property
+    def omegas(self) -> np.ndarray:
+        """各波成分角频率 ω = 2πf（rad/s）。"""
+        frequencies = np.array([c.frequency for c in self.components], dtype=np.float64)
+        return 2.0 * math.pi * frequencies
+
+    @cached_property
+    def wave_vectors(self) -> np.ndarray:
+        """各波成分波数向量 (kx, ky)（东西、南北方向），shape: (2, n_components)。"""
+        wave_numbers = np.array([c.wave_number for c in self.components], dtype=np.float64)
+        direction_rad = np.radians([c.direction_deg for c in self.components])
+        return np.stack(
+            (wave_numbers * np.sin(direction_rad), wave_numbers * np.cos(direction_rad))
+        )
+
@@ -20,6 +20,8 @@ from app.schemas.base import (
     WindConfig,
 )
 from app.schemas.data import (
+    ArraySimulationFrame,
+    CompactSimulationFrame,
     SimulationFrame,
     SimulationStatus,
     WavePoint,
@@ -35,6 +37,8 @@ __all__ = [
     # 数据模型
     "WavePoint",
     "SimulationFrame",
+    "ArraySimulationFrame",
+    "CompactSimulationFrame",
     "SimulationStatus",
     # API 请求/响应
     "AreaSimulationRequest",
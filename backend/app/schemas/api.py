@@ -2,7 +2,7 @@
 API 请求/响应 Schema 定义。
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 
 from pydantic import BaseModel, Field
 
@@ -13,7 +13,12 @@ from app.schemas.base import (
     TimeConfig,
     WindConfig,
 )
-from app.schemas.data import SimulationFrame, SimulationStatus
+from app.schemas.data import (
+    ArraySimulationFrame,
+    CompactSimulationFrame,
+    SimulationFrame,
+    SimulationStatus,
+)
 
 
 class AreaSimulationRequest(BaseModel):
@@ -38,7 +43,11 @@ class SimulationFramesResponse(BaseModel):
 
     simulation_id: str = Field(..., description="模拟任务 ID")
     status: SimulationStatus = Field(..., description="任务状态")
-    frames: List[SimulationFrame] = Field(..., description="模拟时间序列帧")
+    # 帧结构由请求的 point_format 决定：object -> SimulationFrame，array -> ArraySimulationFrame，
+    # columns / columns_f32 -> CompactSimulationFrame
+    frames: List[
+        Union[SimulationFrame, ArraySimulationFrame, CompactSimulationFrame]
+    ] = Field(..., description="模拟时间序列帧")
 
 
 class PointQueryRequest(BaseModel):
@@ -75,6 +75,17 @@ class SpectrumConfig(BaseModel):
         le=7,
         description="JONSWAP 峰锐系数，仅 spectrum_model_type = JONSWAP 时使用",
     )
+    energy_coverage: float = Field(
+        default=0.999,
+        gt=0,
+        le=1,
+        description="保留的波成分累计能量占总能量的比例，其余能量很小的成分被裁剪",
+    )
+    max_components: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="保留的波成分数上限（按能量从大到小），None 表示不限制",
+    )
 
 
 class DiscretizationConfig(BaseModel):
@@ -114,6 +125,16 @@ class TimeConfig(BaseModel):
         gt=0,
         description="缓存保留时间（秒），None 表示不限制，超过此时间的旧帧将被淘汰。例如 60 表示只保留最近 60 秒的帧",
     )
+    realtime: bool = Field(
+        default=True,
+        description="是否按真实时间推进（模拟时间与真实时间 1:1），False 表示不等待、按计算速度尽快推进",
+    )
+    pipeline_depth: int = Field(
+        default=3,
+        ge=1,
+        le=16,
+        description="预计算深度：最多提前计算的帧数，用于吸收偶发的单步计算超时",
+    )
 
     @validator("T_total")
     def validate_T_total(cls, v):
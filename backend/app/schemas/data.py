@@ -5,7 +5,7 @@
 """
 
 from enum import Enum
-from typing import List
+from typing import List, Optional, Tuple
 
 from pydantic import BaseModel, Field
 
@@ -38,3 +38,34 @@ class SimulationFrame(BaseModel):
     region: Region = Field(..., description="区域定义")
     points: List[WavePoint] = Field(..., description="该区域内离散点的海浪高度数据")
 
+
+class ArraySimulationFrame(BaseModel):
+    """某一时刻的区域海浪高度场（每个点为 [经度, 纬度, 海浪高度] 数组，不携带字段名）。"""
+
+    time: float = Field(..., description="时间（秒），相对于 t=0 的偏移")
+    region: Region = Field(..., description="区域定义")
+    points: List[Tuple[float, float, float]] = Field(
+        ..., description="该区域内离散点的 [经度（度）, 纬度（度）, 海浪高度（米）]"
+    )
+
+
+class CompactSimulationFrame(BaseModel):
+    """
+    某一时刻的区域海浪高度场（列式：各点的经度、纬度、海浪高度分别为一个数组，按下标对应）。
+
+    海浪高度为 wave_height（JSON 数组）或 wave_height_f32（float32 二进制的 base64）之一。
+    """
+
+    time: float = Field(..., description="时间（秒），相对于 t=0 的偏移")
+    region: Region = Field(..., description="区域定义")
+    lon: List[float] = Field(..., description="各点经度（度）")
+    lat: List[float] = Field(..., description="各点纬度（度）")
+    wave_height: Optional[List[float]] = Field(None, description="各点海浪高度（米）")
+    wave_height_f32: Optional[str] = Field(
+        None,
+        description=(
+            "各点海浪高度（米），小端 float32（<f4，每点 4 字节）数组的 base64 编码，"
+            "第 i 个值对应 lon[i]、lat[i]（前端可用 Float32Array 还原）"
+        ),
+    )
+
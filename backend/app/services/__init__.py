@@ -7,6 +7,7 @@
 from app.services.interpolation import query_point
 from app.services.simulation import (
     advance_wave_field,
+    build_frame,
     create_wave_grid,
     initialize_wave_field,
     simulate_area,
@@ -19,6 +20,7 @@ __all__ = [
     "generate_spectrum",
     "initialize_wave_field",
     "advance_wave_field",
+    "build_frame",
     "simulate_area",
     "create_wave_grid",
     "query_point",
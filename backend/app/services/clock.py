@@ -0,0 +1,99 @@
+"""
+模拟时钟（节拍源）。
+
+控制模拟循环每个时间步之间的等待方式：
+- 实时模式：模拟时间与真实时间同步（1:1），每步等待到 dt；
+- 虚拟模式：不等待真实时间，只让出事件循环，按计算速度尽快推进。
+"""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from app.schemas.base import TimeConfig
+
+logger = logging.getLogger(__name__)
+
+# 落后于计划时刻超过 dt 的该比例时记录超时警告，并重新对齐计划时刻
+OVERRUN_TOLERANCE = 0.1
+
+
+class TickSource(ABC):
+    """节拍源抽象基类，子类须实现 wait()。"""
+
+    def reset(self) -> None:
+        """重新开始计时（启动或从暂停恢复时调用）。"""
+
+    @abstractmethod
+    async def wait(
+        self, dt: float, stop_event: Optional[asyncio.Event] = None
+    ) -> bool:
+        """
+        等待进入下一个时间步，期间若停止事件被设置则立即返回。
+
+        Args:
+            dt: 时间步长（秒）
+            stop_event: 可选的停止事件
+
+        Returns:
+            停止事件已被设置时返回 True，否则返回 False
+        """
+
+
+class RealTimeTickSource(TickSource):
+    """
+    实时节拍源：按绝对计划时刻等待，使模拟时间与真实时间同步。
+
+    每步的计划时刻在上一计划时刻上累加 dt（而不是从本步开始时刻起算），
+    单步的休眠抖动会在下一步被抵消，不会累积为漂移。
+    """
+
+    def __init__(self) -> None:
+        self._next_deadline: Optional[float] = None
+
+    def reset(self) -> None:
+        self._next_deadline = None
+
+    async def wait(
+        self, dt: float, stop_event: Optional[asyncio.Event] = None
+    ) -> bool:
+        now = asyncio.get_running_loop().time()
+        if self._next_deadline is None:
+            self._next_deadline = now
+        self._next_deadline += dt
+
+        delay = self._next_deadline - now
+        if delay > 0:
+            if stop_event is None:
+                await asyncio.sleep(delay)
+                return False
+            # 以停止事件为等待对象、计划时刻为超时，停止请求可立即打断等待
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+        elif -delay > OVERRUN_TOLERANCE * dt:
+            logger.warning(
+                f"Simulation step overran: {-delay * 1000:.1f} ms behind schedule (dt {dt * 1000:.1f} ms)"
+            )
+            # 落后过多时重新对齐，不再连续追赶
+            self._next_deadline = now
+        return stop_event is not None and stop_event.is_set()
+
+
+class VirtualTickSource(TickSource):
+    """虚拟节拍源：不等待真实时间，只让出事件循环。"""
+
+    async def wait(
+        self, dt: float, stop_event: Optional[asyncio.Event] = None
+    ) -> bool:
+        await asyncio.sleep(0)
+        return stop_event is not None and stop_event.is_set()
+
+
+def create_tick_source(time_config: TimeConfig) -> TickSource:
+    """根据时间配置创建节拍源。"""
+    if time_config.realtime:
+        return RealTimeTickSource()
+    return VirtualTickSource()
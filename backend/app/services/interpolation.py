@@ -4,12 +4,107 @@
 基于区域模拟结果，使用空间双线性插值和时间线性插值查询任意点的海浪高度。
 """
 
+import bisect
+
 import numpy as np
 
 from app.models.grid import WaveGrid
 from app.schemas.data import SimulationStatus
 from app.utils.coordinate import lonlat_to_xy
-from app.utils.numerical import bilinear_interpolation, linear_interpolation
+from app.utils.jit import NUMBA_AVAILABLE, njit
+from app.utils.numerical import bilinear_interpolation_xy, linear_interpolation
+
+
+@njit(cache=True)
+def _axis_weight(axis, value):
+    """在升序坐标轴上定位 value 所在区间，返回 (i0, i1, w)；超出范围时夹紧到边界。"""
+    n = axis.shape[0]
+    if n == 1 or value <= axis[0]:
+        return 0, 0, 0.0
+    if value >= axis[n - 1]:
+        return n - 1, n - 1, 0.0
+    i1 = np.searchsorted(axis, value)
+    i0 = i1 - 1
+    return i0, i1, (value - axis[i0]) / (axis[i1] - axis[i0])
+
+
+@njit(cache=True, fastmath=True)
+def _bilinear_in_time(times, lons, lats, heights, lon, lat, t):
+    """
+    规则网格上的时空插值内核（空间双线性 + 时间线性）。
+
+    Args:
+        times: 时间数组（升序），shape: (n_times,)
+        lons: 经度轴（升序），shape: (n_lon,)
+        lats: 纬度轴（升序），shape: (n_lat,)
+        heights: 海浪高度，shape: (n_times, n_lat, n_lon)
+        lon: 查询点经度（度）
+        lat: 查询点纬度（度）
+        t: 查询时间（秒）
+
+    Returns:
+        海浪高度（米）
+    """
+    t0, t1, wt = _axis_weight(times, t)
+    j0, j1, wx = _axis_weight(lons, lon)
+    k0, k1, wy = _axis_weight(lats, lat)
+
+    result = 0.0
+    for ti, tw in ((t0, 1.0 - wt), (t1, wt)):
+        h = heights[ti]
+        result += tw * (
+            (1.0 - wy) * ((1.0 - wx) * h[k0, j0] + wx * h[k0, j1])
+            + wy * ((1.0 - wx) * h[k1, j0] + wx * h[k1, j1])
+        )
+    return result
+
+
+def warmup_interpolation() -> None:
+    """预编译插值内核，避免首个查询请求承担 JIT 编译延迟。"""
+    if not NUMBA_AVAILABLE:
+        return
+    axis = np.array([0.0, 1.0])
+    for dtype in (np.float64, np.float32):
+        _bilinear_in_time(
+            axis, axis, axis, np.zeros((2, 2, 2), dtype=dtype), 0.5, 0.5, 0.5
+        )
+
+
+def query_point_from_frame(
+    wave_height: np.ndarray,
+    axis_lons: np.ndarray,
+    axis_lats: np.ndarray,
+    point_order: np.ndarray,
+    lon: float,
+    lat: float,
+) -> float:
+    """
+    在单帧上查询指定点的海浪高度（规则网格，空间双线性插值）。
+
+    只读取包围查询点的 4 个角点，不构建整帧或整个时间序列的网格。
+
+    Args:
+        wave_height: 单帧各点海浪高度（帧内点顺序）
+        axis_lons: 经度轴（升序），shape: (n_lon,)
+        axis_lats: 纬度轴（升序），shape: (n_lat,)
+        point_order: 网格点序号（lat 为外层、lon 为内层）到帧内点序号的映射
+        lon: 查询点经度（度）
+        lat: 查询点纬度（度）
+
+    Returns:
+        海浪高度（米）
+    """
+    j0, j1, wx = _axis_weight(axis_lons, float(lon))
+    k0, k1, wy = _axis_weight(axis_lats, float(lat))
+    n_lon = len(axis_lons)
+
+    def height(k: int, j: int) -> float:
+        return wave_height[point_order[k * n_lon + j]]
+
+    return float(
+        (1.0 - wy) * ((1.0 - wx) * height(k0, j0) + wx * height(k0, j1))
+        + wy * ((1.0 - wx) * height(k1, j0) + wx * height(k1, j1))
+    )
 
 
 def query_point(
@@ -32,6 +127,22 @@ def query_point(
     Returns:
         海浪高度（米）
     """
+    # 规则网格：直接在 (time, lat, lon) 数组上插值
+    heights_3d = wave_grid.heights_3d
+    if heights_3d is not None:
+        return float(
+            _bilinear_in_time(
+                np.ascontiguousarray(wave_grid.times, dtype=np.float64),
+                wave_grid.axis_lons,
+                wave_grid.axis_lats,
+                heights_3d,
+                float(lon),
+                float(lat),
+                float(time),
+            )
+        )
+
+    # 非规则网格：使用通用插值
     # 检查时间范围
     if time < wave_grid.times[0] or time > wave_grid.times[-1]:
         # 超出范围，返回边界值
@@ -40,8 +151,8 @@ def query_point(
         else:
             time = wave_grid.times[-1]
 
-    # 找到时间索引
-    time_idx = np.searchsorted(wave_grid.times, time)
+    # 找到时间索引（单个标量查找，bisect 比 np.searchsorted 的调用开销小）
+    time_idx = bisect.bisect_left(wave_grid.times, time)
 
     # 如果正好在某个时间点上
     if time_idx < len(wave_grid.times) and abs(
@@ -64,22 +175,17 @@ def query_point(
             v1 = wave_grid.wave_heights[time_idx - 1]
             v2 = wave_grid.wave_heights[time_idx]
 
-            # 对每个网格点进行时间插值
-            values = np.zeros(len(wave_grid.grid_points))
-            for i in range(len(wave_grid.grid_points)):
-                values[i] = linear_interpolation(
-                    time, t1, v1[i], t2, v2[i]
-                )
+            # 对所有网格点整体进行时间插值（linear_interpolation 对数组逐元素成立）
+            values = linear_interpolation(time, t1, v1, t2, v2)
 
     # 计算查询点的本地坐标
     # 使用所有网格点的中心作为原点（更准确）
-    origin_lon = np.mean([p.lon for p in wave_grid.grid_points])
-    origin_lat = np.mean([p.lat for p in wave_grid.grid_points])
+    origin_lon, origin_lat = wave_grid.origin
     x, y = lonlat_to_xy(lon, lat, origin_lon, origin_lat)
 
-    # 空间双线性插值
-    height = bilinear_interpolation(
-        x, y, wave_grid.grid_points, values
+    # 空间双线性插值（使用缓存的网格点坐标数组）
+    height = bilinear_interpolation_xy(
+        x, y, wave_grid.point_xs, wave_grid.point_ys, values
     )
 
     return height
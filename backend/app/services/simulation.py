@@ -4,11 +4,15 @@
 根据区域、风场、波浪谱等配置，生成时变海浪高度场。
 """
 
+import bisect
 import math
-from typing import List
+from collections import OrderedDict
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
 
 import numpy as np
 
+from app.core.config import settings
 from app.models.grid import GridPoint, WaveGrid
 from app.models.spectrum import WaveSpectrum
 from app.schemas.base import (
@@ -22,52 +26,382 @@ from app.schemas.data import SimulationFrame, WavePoint
 from app.services.spectrum import generate_spectrum
 from app.services.wind import create_wind_field
 from app.utils.coordinate import create_grid
+from app.utils.gpu import CUPY_AVAILABLE, cp
+from app.utils.jit import NUMBA_AVAILABLE, njit, prange
 
 # 重力加速度（m/s²）
 G = 9.81
 
+# 海浪高度场的计算与存储精度：波高只需厘米级精度，float32 的误差（< 1e-5 m）可忽略，
+# 相比 float64 缓存系数与帧缓冲区的内存和带宽减半
+WAVE_HEIGHT_DTYPE = np.float32
 
-def initialize_wave_field(
-    spectrum: WaveSpectrum, grid_points: List[GridPoint]
-) -> np.ndarray:
+
+def grid_xy(grid_points: List[GridPoint]) -> Tuple[np.ndarray, np.ndarray]:
     """
-    初始化 t=0 时刻的海浪场。
+    提取网格点的本地坐标数组（SoA）。
 
-    使用叠加法：η(x,y,t) = Σ Aᵢ * cos(kᵢ·r - ωᵢt + φᵢ)
+    Args:
+        grid_points: 网格点列表
+
+    Returns:
+        (xs, ys) 两个数组，shape: (n_points,)
+    """
+    n_points = len(grid_points)
+    xs = np.fromiter((p.x for p in grid_points), dtype=np.float64, count=n_points)
+    ys = np.fromiter((p.y for p in grid_points), dtype=np.float64, count=n_points)
+    return xs, ys
+
+
+def grid_lonlat(grid_points: List[GridPoint]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    提取网格点的经纬度数组（SoA）。
 
     Args:
-        spectrum: 波浪谱
         grid_points: 网格点列表
 
     Returns:
-        初始海浪高度数组，shape: (n_points,)
+        (lons, lats) 两个数组，shape: (n_points,)
     """
     n_points = len(grid_points)
-    wave_height = np.zeros(n_points)
+    lons = np.fromiter((p.lon for p in grid_points), dtype=np.float64, count=n_points)
+    lats = np.fromiter((p.lat for p in grid_points), dtype=np.float64, count=n_points)
+    return lons, lats
+
+
+@njit(cache=True, parallel=True, fastmath=True)
+def _superpose_components(amplitude, kx, ky, offset, xs, ys, out):
+    """
+    逐网格点叠加全部波成分：out[i] = Σ amplitude[c] * cos(kx[c]*xs[i] + ky[c]*ys[i] + offset[c])。
+
+    各网格点并行计算，相位、余弦与累加在寄存器中完成，不产生 (n_components, n_points) 临时数组。
+    """
+    n_components = amplitude.shape[0]
+    for i in prange(xs.shape[0]):
+        x = xs[i]
+        y = ys[i]
+        total = 0.0
+        for c in range(n_components):
+            total += amplitude[c] * math.cos(kx[c] * x + ky[c] * y + offset[c])
+        out[i] = total
+
+
+def compute_wave_field(
+    spectrum: WaveSpectrum, xs: np.ndarray, ys: np.ndarray, time: float
+) -> np.ndarray:
+    """
+    计算 time 时刻的海浪场。
 
-    for component in spectrum.components:
-        # 波数向量（方向）
-        k = component.wave_number
-        direction_rad = math.radians(component.direction_deg)
-        kx = k * math.sin(direction_rad)  # 东西方向
-        ky = k * math.cos(direction_rad)  # 南北方向
+    使用叠加法：η(x,y,t) = Σ Aᵢ * cos(kᵢ·r - ωᵢt + φᵢ)。
+    已安装 numba 时由并行内核逐点叠加；否则每个波成分对全部网格点整体计算
+    （逐成分循环，不逐点循环）。
 
-        # 角频率
-        omega = 2.0 * math.pi * component.frequency
+    Args:
+        spectrum: 波浪谱
+        xs: 网格点 x 坐标数组（本地坐标，米）
+        ys: 网格点 y 坐标数组（本地坐标，米）
+        time: 时间（秒）
 
-        # 对每个网格点计算贡献
-        for i, point in enumerate(grid_points):
-            # 波数向量与位置向量的点积
-            k_dot_r = kx * point.x + ky * point.y
+    Returns:
+        海浪高度数组，shape: (n_points,)
+    """
+    wave_height = np.zeros(len(xs))
+
+    # 各波成分参数（波浪谱上缓存的 SoA 数组），与时间有关的部分合并为相位偏移 φ - ωt
+    kx, ky = spectrum.wave_vectors
+    amplitudes = spectrum.amplitudes
+    offsets = spectrum.phases - spectrum.omegas * time
+
+    if NUMBA_AVAILABLE:
+        _superpose_components(
+            amplitudes,
+            kx,
+            ky,
+            offsets,
+            np.ascontiguousarray(xs, dtype=np.float64),
+            np.ascontiguousarray(ys, dtype=np.float64),
+            wave_height,
+        )
+        return wave_height
 
-            # 叠加波成分
-            wave_height[i] += component.amplitude * math.cos(
-                k_dot_r - omega * 0.0 + component.phase
-            )
+    for c in range(len(amplitudes)):
+        # 波数向量与位置向量的点积，叠加波成分
+        wave_height += amplitudes[c] * np.cos(kx[c] * xs + ky[c] * ys + offsets[c])
 
     return wave_height
 
 
+def warmup_wave_field() -> None:
+    """预编译海浪场内核，避免首个模拟任务承担 JIT 编译延迟。"""
+    if not NUMBA_AVAILABLE:
+        return
+    values = np.zeros(1)
+    _superpose_components(values, values, values, values, values, values, np.zeros(1))
+
+
+class WaveFieldEvaluator:
+    """
+    海浪场计算器：预先计算与时间无关的部分，之后按时刻计算海浪场。
+
+    η(x,y,t) = Σ Aᵢ * cos(θᵢ - ωᵢt)，其中 θᵢ = kᵢ·r + φᵢ 与时间无关。按三角恒等式展开：
+    η = Σ [Aᵢcos(θᵢ)] * cos(ωᵢt) + [Aᵢsin(θᵢ)] * sin(ωᵢt)，
+    即 η = Re(Σ Aᵢe^{iθᵢ} * e^{-iωᵢt}) 的实数形式。方括号中的系数按 (2 * n_components, n_points)
+    数组缓存一次，每个时刻只需计算长度为 n_components 的 cos(ωt)、sin(ωt)，
+    再做一次矩阵-向量乘法，不再对每个网格点逐成分求余弦。
+    系数与结果均为 WAVE_HEIGHT_DTYPE 精度（相位在 float64 下计算后再转换）。
+    系数数组超过 COEFFICIENTS_MAX_ELEMENTS 个元素时不缓存，逐成分计算（与 compute_wave_field 相同）。
+    """
+
+    # 缓存的系数数组的元素数上限（float32，约 64 MB）
+    COEFFICIENTS_MAX_ELEMENTS = 16 * 1024 * 1024
+    # 在 GPU 上缓存系数的元素数范围（启用 USE_GPU 时）：较小的网格在 CPU 上计算更快
+    # （每步的数据传输与内核启动开销占主导），上限按显存占用（float32，约 1 GB）
+    GPU_MIN_ELEMENTS = 1024 * 1024
+    GPU_MAX_ELEMENTS = 256 * 1024 * 1024
+    # at_times 每块权重矩阵的元素数上限（约 4 MB）：块足够大时矩阵乘法已接近整体计算的效率
+    TIME_BLOCK_ELEMENTS = 512 * 1024
+
+    def __init__(self, spectrum: WaveSpectrum, xs: np.ndarray, ys: np.ndarray):
+        """
+        Args:
+            spectrum: 波浪谱
+            xs: 网格点 x 坐标数组（本地坐标，米）
+            ys: 网格点 y 坐标数组（本地坐标，米）
+        """
+        self.spectrum = spectrum
+        self.xs = xs
+        self.ys = ys
+
+        n_elements = 2 * len(spectrum.components) * len(xs)
+        self.on_gpu = (
+            settings.use_gpu
+            and CUPY_AVAILABLE
+            and self.GPU_MIN_ELEMENTS <= n_elements <= self.GPU_MAX_ELEMENTS
+        )
+        self.coefficients: Optional[np.ndarray] = None
+        if self.on_gpu:
+            # 系数数组在 GPU 上构建并常驻显存（cupy 数组）
+            self.coefficients = self._build_coefficients(cp, spectrum, xs, ys)
+            self.omega = spectrum.omegas
+        elif n_elements <= self.COEFFICIENTS_MAX_ELEMENTS:
+            self.coefficients = self._build_coefficients(np, spectrum, xs, ys)
+            self.omega = spectrum.omegas
+
+    @staticmethod
+    def _build_coefficients(xp, spectrum: WaveSpectrum, xs: np.ndarray, ys: np.ndarray):
+        """
+        构建系数数组 [Aᵢcos(θᵢ); Aᵢsin(θᵢ)]，shape: (2 * n_components, n_points)。
+
+        xp 为 numpy 或 cupy 模块，两者接口一致，分别在 CPU / GPU 上构建。
+        """
+        n_components = len(spectrum.components)
+        kx, ky = xp.asarray(spectrum.wave_vectors)
+        phase = xp.asarray(spectrum.phases)
+        amplitude = xp.asarray(spectrum.amplitudes)[:, None]
+        xs = xp.asarray(xs)
+        ys = xp.asarray(ys)
+        # 时间无关相位 θ = k·r + φ，shape: (n_components, n_points)
+        base_phase = kx[:, None] * xs[None, :] + ky[:, None] * ys[None, :] + phase[:, None]
+        coefficients = xp.empty((2 * n_components, len(xs)), dtype=WAVE_HEIGHT_DTYPE)
+        xp.multiply(amplitude, xp.cos(base_phase), out=coefficients[:n_components])
+        xp.multiply(amplitude, xp.sin(base_phase), out=coefficients[n_components:])
+        return coefficients
+
+    def __call__(self, time: float, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        计算 time 时刻的海浪场。
+
+        Args:
+            time: 时间（秒）
+            out: 可选的输出数组（shape: (n_points,)，dtype: WAVE_HEIGHT_DTYPE），
+                提供时结果直接写入其中，不再分配新数组
+
+        Returns:
+            海浪高度数组，shape: (n_points,)，dtype: WAVE_HEIGHT_DTYPE（提供 out 时即 out）
+        """
+        if self.coefficients is None:
+            wave_height = compute_wave_field(self.spectrum, self.xs, self.ys, time)
+            if out is None:
+                return wave_height.astype(WAVE_HEIGHT_DTYPE)
+            out[:] = wave_height
+            return out
+        if self.on_gpu:
+            # GPU 上做一次矩阵-向量乘法，只传输长度为 2 * n_components 的权重与结果
+            weights = _time_weights(self.omega, time)
+            wave_height = cp.asnumpy(cp.asarray(weights) @ self.coefficients)
+            if out is None:
+                return wave_height
+            out[:] = wave_height
+            return out
+        return evaluate_wave_field(self.coefficients, self.omega, time, out=out)
+
+    def at_times(self, times: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        计算多个时刻的海浪场。
+
+        海浪场是时间的解析函数，各时刻互不依赖：把各时刻的权重按行排成
+        (n_times, 2 * n_components) 矩阵，做矩阵乘法得到全部时刻的结果，
+        比逐时刻做矩阵-向量乘法更充分地复用缓存的系数数组。
+        时刻按 TIME_BLOCK_ELEMENTS 分块计算，权重矩阵的临时内存不随时刻数增长。
+
+        Args:
+            times: 时间数组（秒），shape: (n_times,)
+            out: 可选的输出数组（shape: (n_times, n_points)，dtype: WAVE_HEIGHT_DTYPE）
+
+        Returns:
+            海浪高度数组，shape: (n_times, n_points)，dtype: WAVE_HEIGHT_DTYPE（提供 out 时即 out）
+        """
+        times = np.asarray(times, dtype=np.float64)
+        if out is None:
+            out = np.empty((len(times), len(self.xs)), dtype=WAVE_HEIGHT_DTYPE)
+        if self.coefficients is None or self.on_gpu:
+            for t_idx, time in enumerate(times.tolist()):
+                self(time, out=out[t_idx])
+            return out
+
+        block = max(1, self.TIME_BLOCK_ELEMENTS // (2 * len(self.omega)))
+        for start in range(0, len(times), block):
+            # ωt 可能很大，在 float64 下求三角函数后再转换精度
+            omega_t = times[start:start + block, None] * self.omega[None, :]
+            weights = np.concatenate(
+                (np.cos(omega_t), np.sin(omega_t)), axis=1
+            ).astype(WAVE_HEIGHT_DTYPE)
+            np.matmul(weights, self.coefficients, out=out[start:start + block])
+        return out
+
+
+def _time_weights(omega: np.ndarray, time: float) -> np.ndarray:
+    """time 时刻的权重 [cos(ωt); sin(ωt)]，shape: (2 * n_components,)，dtype: WAVE_HEIGHT_DTYPE。"""
+    # ωt 可能很大，在 float64 下求三角函数后再转换精度
+    omega_t = omega * time
+    return np.concatenate((np.cos(omega_t), np.sin(omega_t))).astype(WAVE_HEIGHT_DTYPE)
+
+
+def evaluate_wave_field(
+    coefficients: np.ndarray,
+    omega: np.ndarray,
+    time: float,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    由缓存的系数数组计算 time 时刻的海浪场（一次矩阵-向量乘法，见 WaveFieldEvaluator）。
+
+    计算线程（WaveFieldEvaluator）与计算进程（compute_shared_wave_field）共用此函数。
+
+    Args:
+        coefficients: 系数数组 [Aᵢcos(θᵢ); Aᵢsin(θᵢ)]，shape: (2 * n_components, n_points)
+        omega: 各波成分角频率（rad/s），shape: (n_components,)
+        time: 时间（秒）
+        out: 可选的输出数组（shape: (n_points,)，dtype: WAVE_HEIGHT_DTYPE）
+
+    Returns:
+        海浪高度数组，shape: (n_points,)，dtype: WAVE_HEIGHT_DTYPE（提供 out 时即 out）
+    """
+    return np.matmul(_time_weights(omega, time), coefficients, out=out)
+
+
+def _shared_arrays(
+    shm: shared_memory.SharedMemory, n_components: int, n_points: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """共享内存中的 (角频率, 系数数组) 视图：float64 角频率在前，系数数组紧随其后。"""
+    omega = np.ndarray((n_components,), dtype=np.float64, buffer=shm.buf)
+    coefficients = np.ndarray(
+        (2 * n_components, n_points),
+        dtype=WAVE_HEIGHT_DTYPE,
+        buffer=shm.buf,
+        offset=omega.nbytes,
+    )
+    return omega, coefficients
+
+
+class SharedWaveField:
+    """
+    共享内存中的海浪场系数，供计算进程使用。
+
+    把 WaveFieldEvaluator 缓存的角频率与系数数组复制到一块共享内存（每个模拟一块），
+    计算进程按名称映射一次后缓存（compute_shared_wave_field），之后每个时间步只传递时刻，
+    不再传输波浪谱或系数数组。模拟结束时调用 release() 删除共享内存。
+    """
+
+    def __init__(self, wave_field: WaveFieldEvaluator):
+        """
+        Args:
+            wave_field: 已在 CPU 上缓存系数数组的海浪场计算器
+        """
+        omega = wave_field.omega
+        coefficients = wave_field.coefficients
+        self.n_components = len(omega)
+        self.n_points = coefficients.shape[1]
+        self._shm = shared_memory.SharedMemory(
+            create=True, size=max(1, omega.nbytes + coefficients.nbytes)
+        )
+        self.name = self._shm.name
+        shared_omega, shared_coefficients = _shared_arrays(
+            self._shm, self.n_components, self.n_points
+        )
+        shared_omega[:] = omega
+        shared_coefficients[:] = coefficients
+
+    def release(self) -> None:
+        """关闭并删除共享内存（计算进程中已有的映射在关闭前仍然有效）。"""
+        self._shm.close()
+        self._shm.unlink()
+
+
+# 计算进程中已映射的共享内存：名称 -> (共享内存, 角频率, 系数数组)，按最近使用排序
+_attached_wave_fields: "OrderedDict[str, tuple]" = OrderedDict()
+# 每个计算进程保持映射的共享内存块数上限：模拟结束后共享内存已删除，
+# 但进程中的映射仍占用内存，超过上限时关闭最久未使用的映射
+ATTACHED_WAVE_FIELDS_MAX = 4
+
+
+def compute_shared_wave_field(
+    name: str, n_components: int, n_points: int, time: float
+) -> np.ndarray:
+    """
+    在计算进程中计算 time 时刻的海浪场（系数数组位于共享内存 name 中，见 SharedWaveField）。
+
+    共享内存在每个进程中只映射一次，计算与计算线程相同（evaluate_wave_field）。
+
+    Returns:
+        海浪高度数组，shape: (n_points,)，dtype: WAVE_HEIGHT_DTYPE
+    """
+    entry = _attached_wave_fields.get(name)
+    if entry is None:
+        shm = shared_memory.SharedMemory(name=name)
+        entry = (shm, *_shared_arrays(shm, n_components, n_points))
+        _attached_wave_fields[name] = entry
+        while len(_attached_wave_fields) > ATTACHED_WAVE_FIELDS_MAX:
+            # 先释放数组视图，共享内存才能关闭
+            stale = _attached_wave_fields.popitem(last=False)[1]
+            stale_shm = stale[0]
+            del stale
+            stale_shm.close()
+    else:
+        _attached_wave_fields.move_to_end(name)
+    _, omega, coefficients = entry
+    return evaluate_wave_field(coefficients, omega, time)
+
+
+def initialize_wave_field(
+    spectrum: WaveSpectrum, grid_points: List[GridPoint]
+) -> np.ndarray:
+    """
+    初始化 t=0 时刻的海浪场。
+
+    使用叠加法：η(x,y,t) = Σ Aᵢ * cos(kᵢ·r - ωᵢt + φᵢ)
+
+    Args:
+        spectrum: 波浪谱
+        grid_points: 网格点列表
+
+    Returns:
+        初始海浪高度数组，shape: (n_points,)
+    """
+    xs, ys = grid_xy(grid_points)
+    return compute_wave_field(spectrum, xs, ys, 0.0)
+
+
 def advance_wave_field(
     wave_height: np.ndarray,
     spectrum: WaveSpectrum,
@@ -78,8 +412,11 @@ def advance_wave_field(
     """
     时间步进：推进一个时间步长。
 
+    海浪场是时间的解析函数，下一时刻直接按 current_time + dt 计算，不依赖当前时刻的结果；
+    计算多个时刻时可使用 WaveFieldEvaluator.at_times 整体计算。
+
     Args:
-        wave_height: 当前时刻的海浪高度
+        wave_height: 当前时刻的海浪高度（不参与计算，保留以兼容原接口）
         spectrum: 波浪谱
         grid_points: 网格点列表
         dt: 时间步长（秒）
@@ -88,27 +425,75 @@ def advance_wave_field(
     Returns:
         下一时刻的海浪高度数组
     """
-    n_points = len(grid_points)
-    new_wave_height = np.zeros(n_points)
+    xs, ys = grid_xy(grid_points)
+    return compute_wave_field(spectrum, xs, ys, current_time + dt)
+
+
+def build_frame(
+    time: float,
+    region: Region,
+    lons: np.ndarray,
+    lats: np.ndarray,
+    wave_height: np.ndarray,
+) -> SimulationFrame:
+    """
+    由网格点坐标数组（SoA）和海浪高度数组构建 SimulationFrame。
 
-    for component in spectrum.components:
-        # 波数向量
-        k = component.wave_number
-        direction_rad = math.radians(component.direction_deg)
-        kx = k * math.sin(direction_rad)
-        ky = k * math.cos(direction_rad)
+    输入均为已确定类型的数值，使用 construct() 跳过逐点的 Pydantic 校验。
 
-        # 角频率
-        omega = 2.0 * math.pi * component.frequency
+    Args:
+        time: 帧时间（秒）
+        region: 区域配置
+        lons: 网格点经度数组，shape: (n_points,)
+        lats: 网格点纬度数组，shape: (n_points,)
+        wave_height: 海浪高度数组，shape: (n_points,)
 
-        # 对每个网格点计算贡献
-        for i, point in enumerate(grid_points):
-            k_dot_r = kx * point.x + ky * point.y
-            new_wave_height[i] += component.amplitude * math.cos(
-                k_dot_r - omega * (current_time + dt) + component.phase
-            )
+    Returns:
+        SimulationFrame 对象
+    """
+    points = [
+        WavePoint.construct(lon=lon, lat=lat, wave_height=height)
+        for lon, lat, height in zip(
+            np.asarray(lons, dtype=np.float64).tolist(),
+            np.asarray(lats, dtype=np.float64).tolist(),
+            np.asarray(wave_height, dtype=np.float64).tolist(),
+        )
+    ]
+    return SimulationFrame.construct(time=float(time), region=region, points=points)
 
-    return new_wave_height
+
+def steps_within(duration: float, dt: float) -> int:
+    """
+    时长 duration 内完整的时间步数。
+
+    容许浮点误差：例如 0.6 / 0.2 = 2.9999999999999996 计为 3 步。
+    """
+    return int(math.floor(duration / dt + 1e-9))
+
+
+def _offline_times(time_config: TimeConfig) -> np.ndarray:
+    """
+    离线模式的帧时间序列（包含 t=0 和 T_total）。
+
+    配置了缓存保留时间时，只保留最后一帧之前保留时间内的帧（与流式模式的淘汰规则一致）。
+    海浪场可按任意时刻直接计算，被淘汰的帧不必计算，结果数组按保留窗口而不是总时长分配。
+
+    Args:
+        time_config: 时间配置（离线模式必须提供总时长）
+
+    Returns:
+        帧时间数组（升序）
+    """
+    if time_config.T_total is None:
+        raise ValueError("TimeConfig.T_total is required for offline simulation mode.")
+
+    # 按整数步数生成时刻（步数 × dt），不依赖 arange 浮点步长的边界判断
+    dt = time_config.dt_backend
+    times = np.arange(steps_within(time_config.T_total, dt) + 1) * dt
+    if time_config.cache_retention_time is not None and times.size > 0:
+        retention_threshold = times[-1] - time_config.cache_retention_time
+        times = times[bisect.bisect_left(times, retention_threshold):]
+    return times
 
 
 def simulate_area(
@@ -140,50 +525,22 @@ def simulate_area(
     # 3. 生成波浪谱
     spectrum = generate_spectrum(wind, spectrum_config)
 
-    # 4. 初始化 t=0 海浪场
-    initial_height = initialize_wave_field(spectrum, grid_points)
+    # 4. 海浪场计算器（时间无关的相位只计算一次）
+    xs, ys = grid_xy(grid_points)
+    wave_field = WaveFieldEvaluator(spectrum, xs, ys)
 
-    # 5. 生成时间序列（离线模式必须提供总时长）
-    if time_config.T_total is None:
-        raise ValueError("TimeConfig.T_total is required for offline simulation mode.")
-
-    dt = time_config.dt_backend
-    T_total = time_config.T_total
-    times = np.arange(0, T_total + dt / 2, dt)  # 包含 t=0 和 T_total
+    # 5. 生成时间序列（按缓存保留时间裁剪）
+    times = _offline_times(time_config)
 
-    n_times = len(times)
-    n_points = len(grid_points)
-
-    # 存储所有时刻的海浪高度
-    wave_heights = np.zeros((n_times, n_points))
-    wave_heights[0] = initial_height
-
-    # 6. 时间步进
-    for t_idx in range(1, n_times):
-        current_time = times[t_idx - 1]
-        wave_heights[t_idx] = advance_wave_field(
-            wave_heights[t_idx - 1],
-            spectrum,
-            grid_points,
-            dt,
-            current_time,
-        )
+    # 6. 计算保留的各时刻的海浪高度（各时刻互不依赖，整体计算）
+    wave_heights = wave_field.at_times(times)
 
     # 7. 转换为 SimulationFrame 列表
-    frames = []
-    for t_idx, time in enumerate(times):
-        points = [
-            WavePoint(
-                lon=point.lon,
-                lat=point.lat,
-                wave_height=float(wave_heights[t_idx, i]),
-            )
-            for i, point in enumerate(grid_points)
-        ]
-
-        frames.append(
-            SimulationFrame(time=float(time), region=region, points=points)
-        )
+    point_lons, point_lats = grid_lonlat(grid_points)
+    frames = [
+        build_frame(time, region, point_lons, point_lats, wave_heights[t_idx])
+        for t_idx, time in enumerate(times)
+    ]
 
     return frames
 
@@ -215,29 +572,12 @@ def create_wave_grid(
     wind = create_wind_field(wind_config)
     spectrum = generate_spectrum(wind, spectrum_config)
 
-    # 初始化并时间步进（离线模式必须提供总时长）
-    if time_config.T_total is None:
-        raise ValueError("TimeConfig.T_total is required for offline simulation mode.")
-
-    dt = time_config.dt_backend
-    T_total = time_config.T_total
-    times = np.arange(0, T_total + dt / 2, dt)
+    # 按缓存保留时间裁剪的时间序列，整体计算各时刻的海浪场
+    times = _offline_times(time_config)
 
-    n_times = len(times)
-    n_points = len(grid_points)
-
-    wave_heights = np.zeros((n_times, n_points))
-    wave_heights[0] = initialize_wave_field(spectrum, grid_points)
-
-    for t_idx in range(1, n_times):
-        current_time = times[t_idx - 1]
-        wave_heights[t_idx] = advance_wave_field(
-            wave_heights[t_idx - 1],
-            spectrum,
-            grid_points,
-            dt,
-            current_time,
-        )
+    xs, ys = grid_xy(grid_points)
+    wave_field = WaveFieldEvaluator(spectrum, xs, ys)
+    wave_heights = wave_field.at_times(times)
 
     return WaveGrid(
         grid_points=grid_points,
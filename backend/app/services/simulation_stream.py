@@ -5,13 +5,17 @@
 """
 
 import asyncio
+import functools
+import logging
 import math
-from typing import List, Optional
+from concurrent.futures import Executor
+from typing import Optional
 
 import numpy as np
 
-from app.models.grid import GridPoint
-from app.models.spectrum import WaveSpectrum
+from app.core.config import settings
+from app.core.executors import get_compute_executor, get_compute_process_pool
+from app.models.frame import WaveFrame
 from app.schemas.base import (
     DiscretizationConfig,
     Region,
@@ -19,11 +23,20 @@ from app.schemas.base import (
     TimeConfig,
     WindConfig,
 )
-from app.schemas.data import SimulationFrame, WavePoint
+from app.services.simulation import (
+    SharedWaveField,
+    WaveFieldEvaluator,
+    compute_shared_wave_field,
+    grid_lonlat,
+    grid_xy,
+    steps_within,
+)
 from app.services.spectrum import generate_spectrum
 from app.services.wind import create_wind_field
 from app.utils.coordinate import create_grid
 
+logger = logging.getLogger(__name__)
+
 # 重力加速度（m/s²）
 G = 9.81
 
@@ -59,6 +72,10 @@ class SimulationStepper:
         
         # 1. 创建网格
         self.grid_points = create_grid(region, discretization_config)
+        # 网格点经纬度（SoA 数组，各帧共享，帧只保存海浪高度）
+        self.point_lons, self.point_lats = grid_lonlat(self.grid_points)
+        # 网格点本地坐标（SoA 数组），海浪场计算只使用这两个数组
+        self.point_xs, self.point_ys = grid_xy(self.grid_points)
 
         # 2. 生成风场
         wind = create_wind_field(wind_config)
@@ -67,9 +84,11 @@ class SimulationStepper:
         self.spectrum = generate_spectrum(wind, spectrum_config)
 
         # 4. 初始化 t=0 海浪场
-        self.current_wave_height = _initialize_wave_field(
-            self.spectrum, self.grid_points
+        # 海浪场计算器：时间无关的相位只计算一次，之后各时间步复用
+        self._wave_field = WaveFieldEvaluator(
+            self.spectrum, self.point_xs, self.point_ys
         )
+        self.current_wave_height = self._wave_field(0.0)
 
         # 5. 时间配置
         self.dt = time_config.dt_backend
@@ -84,10 +103,20 @@ class SimulationStepper:
         self.is_stopped = False  # 外部请求停止
         
         # 8. 预计算支持（用于流水线计算，减少延迟）
-        self._next_frame_future: Optional[asyncio.Future] = None  # 预计算的下一帧和新的wave_height
+        self.pipeline_depth = time_config.pipeline_depth  # 最多提前计算的帧数
+        self._frame_queue: Optional[asyncio.Queue] = None  # 预计算帧队列（None 表示结束，异常表示出错）
         self._precompute_task: Optional[asyncio.Task] = None  # 预计算任务
+        # 启用计算进程时，把缓存的系数数组放入共享内存，各计算进程映射后直接复用
+        # （网格过大未缓存系数或在 GPU 上计算时为 None，仍在计算线程中计算）
+        self._shared_wave_field: Optional[SharedWaveField] = None
+        if (
+            settings.compute_processes > 0
+            and self._wave_field.coefficients is not None
+            and not self._wave_field.on_gpu
+        ):
+            self._shared_wave_field = SharedWaveField(self._wave_field)
 
-    def step(self) -> Optional[SimulationFrame]:
+    def step(self) -> Optional[WaveFrame]:
         """
         执行一个时间步进，计算并返回下一个时间步的帧。
         
@@ -95,7 +124,7 @@ class SimulationStepper:
         首次调用返回初始时刻（t=0）的帧，后续调用返回逐步计算的帧。
         
         Returns:
-            下一个时间步的 SimulationFrame，如果已完成则返回 None
+            下一个时间步的帧，如果已完成则返回 None
         """
         # 如果已完成或被停止，返回 None
         if self.is_completed or self.is_stopped:
@@ -103,17 +132,12 @@ class SimulationStepper:
 
         # 如果是初始时刻，返回初始帧
         if self.current_time_idx == 0:
-            frame = _create_frame(
-                time=0.0,
-                wave_height=self.current_wave_height,
-                grid_points=self.grid_points,
-                region=self.region,
-            )
+            frame = WaveFrame(time=0.0, wave_height=self.current_wave_height)
             self.current_time_idx += 1
             return frame
 
         # 计算下一时间步的时间
-        next_time = self.current_time + self.dt
+        next_time = self._time_after(self.current_time)
 
         # 如果存在时间上限且下一时刻超出范围，则结束
         if self.time_limit is not None and next_time > self.time_limit + 1e-9:
@@ -121,22 +145,10 @@ class SimulationStepper:
             return None
 
         # 计算下一个时间步
-        current_time = self.current_time
-        self.current_wave_height = _advance_wave_field(
-            self.current_wave_height,
-            self.spectrum,
-            self.grid_points,
-            self.dt,
-            current_time,
-        )
+        self.current_wave_height = self._wave_field(next_time)
 
         # 创建并返回当前时间步的帧
-        frame = _create_frame(
-            time=next_time,
-            wave_height=self.current_wave_height,
-            grid_points=self.grid_points,
-            region=self.region,
-        )
+        frame = WaveFrame(time=next_time, wave_height=self.current_wave_height)
 
         self.current_time = next_time
         self.current_time_idx += 1
@@ -154,7 +166,7 @@ class SimulationStepper:
         """获取总时间步数（包括初始时刻）。无限制时返回 math.inf。"""
         if self.time_limit is None:
             return math.inf
-        return int(math.floor(self.time_limit / self.dt)) + 1
+        return steps_within(self.time_limit, self.dt) + 1
 
     def get_current_step(self) -> int:
         """获取当前已计算的步数（0表示还未开始，1表示已计算初始时刻）。"""
@@ -168,115 +180,176 @@ class SimulationStepper:
         if self._precompute_task is not None and not self._precompute_task.done():
             self._precompute_task.cancel()
     
+    def release(self) -> None:
+        """
+        停止模拟并释放步进器持有的计算数据（海浪场、网格点、波浪谱与预计算队列）。
+
+        模拟循环结束后调用，之后步进器不可再使用。
+        """
+        self.stop()
+        self._precompute_task = None
+        self._frame_queue = None
+        self.current_wave_height = np.empty(0)
+        self.grid_points = []
+        self.point_xs = np.empty(0)
+        self.point_ys = np.empty(0)
+        self.spectrum = None
+        self._wave_field = None
+        if self._shared_wave_field is not None:
+            self._shared_wave_field.release()
+            self._shared_wave_field = None
+
     async def precompute_next_frame(self, loop: asyncio.AbstractEventLoop) -> None:
         """
-        在后台预计算下一帧（异步）。
+        启动后台预计算（异步）。
         
-        这个方法在后台执行器中进行计算，完成后将结果存储在 _next_frame_future 中。
-        预计算包括：计算下一时间步的 wave_height 和创建帧，但不更新 stepper 的状态。
+        预计算任务在共享的计算线程池中逐帧计算后续时间步，结果放入容量为 pipeline_depth 的队列，
+        队列已满时暂停计算；get_precomputed_frame 从队列取出结果并更新 stepper 的状态。
+        这样单步计算偶尔超过 dt 时，已提前计算的帧可以吸收延迟。
         """
         if self.is_completed or self.is_stopped:
             return
         
-        # 如果已经有预计算任务在运行，不重复启动
-        if self._next_frame_future is not None and not self._next_frame_future.done():
+        # 如果预计算任务已在运行，不重复启动
+        if self._precompute_task is not None and not self._precompute_task.done():
             return
         
-        # 创建 Future 用于存储预计算结果
-        self._next_frame_future = loop.create_future()
-        
-        # 在后台执行器中计算下一帧
-        def compute_frame():
-            """同步计算函数，在后台线程中执行。"""
+        self._frame_queue = asyncio.Queue(maxsize=self.pipeline_depth)
+        self._precompute_task = asyncio.create_task(
+            self._run_precompute(loop, self.current_time)
+        )
+
+    def _time_after(self, current_time: float) -> float:
+        """
+        current_time 的下一时间步时刻。
+
+        按步数计算（步数 × dt），而不是逐步累加 dt，浮点误差不随运行时长累积。
+        """
+        return (round(current_time / self.dt) + 1) * self.dt
+
+    def _next_frame_time(self, current_time: float) -> Optional[float]:
+        """current_time 的下一时间步时刻；已完成、被停止或超出时间上限时返回 None。"""
+        # 如果已完成或被停止，返回 None
+        if self.is_completed or self.is_stopped:
+            return None
+
+        # 计算下一时间步的时间
+        next_time = self._time_after(current_time)
+
+        # 如果存在时间上限且下一时刻超出范围，则结束
+        if self.time_limit is not None and next_time > self.time_limit + 1e-9:
+            return None
+        return next_time
+
+    def _compute_frame(self, current_time: float) -> Optional[WaveFrame]:
+        """
+        同步计算 current_time 的下一时间步，在计算线程中执行。
+
+        海浪场计算器的矩阵运算在 NumPy 内部释放 GIL，与事件循环真正并行。
+
+        Returns:
+            下一时间步的帧，已完成或被停止时返回 None（计算出错时抛出异常）
+        """
+        next_time = self._next_frame_time(current_time)
+        # 取局部引用：步进器被释放（release）后不再计算
+        wave_field = self._wave_field
+        if next_time is None or wave_field is None:
+            return None
+
+        # 帧的海浪高度即为新的海浪场，get_precomputed_frame 中直接应用，避免重复计算
+        return WaveFrame(time=next_time, wave_height=wave_field(next_time))
+
+    async def _compute_frame_in_process(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        compute_pool: Executor,
+        shared_wave_field: SharedWaveField,
+        current_time: float,
+    ) -> Optional[WaveFrame]:
+        """
+        在计算进程中计算 current_time 的下一时间步。
+
+        系数数组已放入共享内存，每步只向计算进程传递时刻，计算与计算线程相同；
+        事件循环直接等待进程的结果，不占用计算线程转发。
+
+        Returns:
+            下一时间步的帧，已完成或被停止时返回 None（计算出错、计算进程崩溃时抛出异常）
+        """
+        next_time = self._next_frame_time(current_time)
+        if next_time is None:
+            return None
+        wave_height = await loop.run_in_executor(
+            compute_pool,
+            compute_shared_wave_field,
+            shared_wave_field.name,
+            shared_wave_field.n_components,
+            shared_wave_field.n_points,
+            next_time,
+        )
+        return WaveFrame(time=next_time, wave_height=wave_height)
+
+    async def _run_precompute(
+        self, loop: asyncio.AbstractEventLoop, current_time: float
+    ) -> None:
+        """
+        预计算任务：从 current_time 开始逐帧计算并放入队列，直到结束（放入 None）。
+
+        计算出错（包括计算进程崩溃、参数无法序列化等）时把异常放入队列后结束，
+        由 get_precomputed_frame 重新抛出，而不是当作模拟正常结束。
+        """
+        compute_pool = get_compute_process_pool()
+        # 系数数组未放入共享内存（网格过大或在 GPU 上计算）时在计算线程中计算
+        shared_wave_field = (
+            self._shared_wave_field if compute_pool is not None else None
+        )
+        while True:
             try:
-                # 如果已完成或被停止，返回 None
-                if self.is_completed or self.is_stopped:
-                    return None
-                
-                # 如果是初始时刻，计算第一个时间步
-                if self.current_time_idx == 0:
-                    # 初始帧已经返回，现在计算第一个时间步（t=dt）
-                    next_time = self.dt
+                if shared_wave_field is not None:
+                    result = await self._compute_frame_in_process(
+                        loop, compute_pool, shared_wave_field, current_time
+                    )
                 else:
-                    # 计算下一时间步的时间
-                    next_time = self.current_time + self.dt
-                
-                # 如果存在时间上限且下一时刻超出范围，则结束
-                if self.time_limit is not None and next_time > self.time_limit + 1e-9:
-                    return None
-                
-                # 计算下一个时间步（使用当前的 current_wave_height 和 current_time）
-                current_time = self.current_time if self.current_time_idx > 0 else 0.0
-                new_wave_height = _advance_wave_field(
-                    self.current_wave_height,
-                    self.spectrum,
-                    self.grid_points,
-                    self.dt,
-                    current_time,
-                )
-                
-                # 创建并返回当前时间步的帧
-                frame = _create_frame(
-                    time=next_time,
-                    wave_height=new_wave_height,
-                    grid_points=self.grid_points,
-                    region=self.region,
-                )
-                
-                # 返回 (frame, new_wave_height) 元组，避免在 get_precomputed_frame 中重复计算
-                return (frame, new_wave_height)
-            except Exception as e:
-                # 如果计算出错，返回 None
-                print(f"预计算帧时出错: {e}")
-                return None
-        
-        # 在后台执行器中运行计算
-        async def run_compute():
-            try:
-                frame = await loop.run_in_executor(None, compute_frame)
-                if not self._next_frame_future.cancelled():
-                    self._next_frame_future.set_result(frame)
-            except Exception as e:
-                if not self._next_frame_future.cancelled():
-                    self._next_frame_future.set_exception(e)
-        
-        # 启动预计算任务
-        self._precompute_task = asyncio.create_task(run_compute())
+                    result = await loop.run_in_executor(
+                        get_compute_executor(),
+                        self._compute_frame,
+                        current_time,
+                    )
+            except Exception as exc:
+                await self._frame_queue.put(exc)
+                return
+            await self._frame_queue.put(result)
+            if result is None:
+                return
+            current_time = result.time
     
-    async def get_precomputed_frame(self) -> Optional["SimulationFrame"]:
+    async def get_precomputed_frame(self) -> Optional[WaveFrame]:
         """
-        获取预计算的下一帧（如果已准备好）。
+        获取预计算的下一帧。
         
-        如果预计算已完成，返回帧并更新状态，然后立即开始预计算再下一帧。
+        如果队列中已有预计算结果，立即返回帧并更新状态；否则等待预计算完成。
         
         Returns:
-            预计算的帧，如果未准备好或已完成则返回 None
+            预计算的帧，如果预计算未启动或已完成则返回 None
+
+        Raises:
+            Exception: 预计算出错时重新抛出其异常（由模拟循环将任务标记为失败）
         """
-        if self._next_frame_future is None:
+        if self._frame_queue is None:
             return None
         
-        # 等待预计算完成
-        try:
-            frame = await self._next_frame_future
-        except asyncio.CancelledError:
-            return None
-        except Exception as e:
-            print(f"获取预计算帧时出错: {e}")
-            return None
-        
-        # 清空 Future，准备下一次预计算
-        self._next_frame_future = None
+        frame = await self._frame_queue.get()
+
+        if isinstance(frame, Exception):
+            self.stop()
+            raise frame
         
         if frame is None:
             # 预计算返回 None，表示已完成
             self.is_completed = True
             return None
         
-        # 预计算返回 (frame, new_wave_height) 元组
-        frame, new_wave_height = frame
-        
         # 更新状态：应用预计算的结果
-        self.current_wave_height = new_wave_height  # 直接使用预计算的 wave_height，避免重复计算
+        self.current_wave_height = frame.wave_height  # 直接使用预计算的 wave_height，避免重复计算
         self.current_time = frame.time
         self.current_time_idx += 1
         
@@ -287,10 +360,6 @@ class SimulationStepper:
         ):
             self.is_completed = True
         
-        # 立即开始预计算再下一帧
-        loop = asyncio.get_running_loop()
-        await self.precompute_next_frame(loop)
-        
         return frame
 
 
@@ -305,6 +374,7 @@ async def simulate_area_stream(
     创建并返回模拟步进器实例。
     
     外部时钟负责定期调用 step() 方法，每次调用代表过了一个时间步长。
+    步进器初始化（网格、风场、波浪谱与 t=0 海浪场的计算）在共享的计算线程池中执行，不阻塞事件循环。
 
     Args:
         region: 区域配置
@@ -316,93 +386,15 @@ async def simulate_area_stream(
     Returns:
         SimulationStepper 实例
     """
-    return SimulationStepper(
-        region=region,
-        wind_config=wind_config,
-        spectrum_config=spectrum_config,
-        discretization_config=discretization_config,
-        time_config=time_config,
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_compute_executor(),
+        functools.partial(
+            SimulationStepper,
+            region=region,
+            wind_config=wind_config,
+            spectrum_config=spectrum_config,
+            discretization_config=discretization_config,
+            time_config=time_config,
+        ),
     )
-
-
-def _initialize_wave_field(
-    spectrum: WaveSpectrum, grid_points: List[GridPoint]
-) -> np.ndarray:
-    """初始化 t=0 时刻的海浪场。"""
-    n_points = len(grid_points)
-    wave_height = np.zeros(n_points)
-
-    for component in spectrum.components:
-        k = component.wave_number
-        direction_rad = math.radians(component.direction_deg)
-        kx = k * math.sin(direction_rad)
-        ky = k * math.cos(direction_rad)
-        omega = 2.0 * math.pi * component.frequency
-
-        for i, point in enumerate(grid_points):
-            k_dot_r = kx * point.x + ky * point.y
-            wave_height[i] += component.amplitude * math.cos(
-                k_dot_r - omega * 0.0 + component.phase
-            )
-
-    return wave_height
-
-
-def _advance_wave_field(
-    wave_height: np.ndarray,
-    spectrum: WaveSpectrum,
-    grid_points: List[GridPoint],
-    dt: float,
-    current_time: float,
-) -> np.ndarray:
-    """
-    时间步进：推进一个时间步长。
-    
-    Args:
-        wave_height: 当前时刻的海浪高度
-        spectrum: 波浪谱
-        grid_points: 网格点列表
-        dt: 时间步长（秒）
-        current_time: 当前时间（秒）
-    
-    Returns:
-        下一时刻的海浪高度数组
-    """
-    n_points = len(grid_points)
-    new_wave_height = np.zeros(n_points)
-
-    for component in spectrum.components:
-        k = component.wave_number
-        direction_rad = math.radians(component.direction_deg)
-        kx = k * math.sin(direction_rad)
-        ky = k * math.cos(direction_rad)
-        omega = 2.0 * math.pi * component.frequency
-
-        for i, point in enumerate(grid_points):
-            k_dot_r = kx * point.x + ky * point.y
-            new_wave_height[i] += component.amplitude * math.cos(
-                k_dot_r - omega * (current_time + dt) + component.phase
-            )
-
-    return new_wave_height
-
-
-def _create_frame(
-    time: float,
-    wave_height: np.ndarray,
-    grid_points: List[GridPoint],
-    region: Region,
-) -> SimulationFrame:
-    """创建单个时间步的帧。"""
-    points = [
-        WavePoint(
-            lon=point.lon,
-            lat=point.lat,
-            wave_height=float(wave_height[i]),
-        )
-        for i, point in enumerate(grid_points)
-    ]
-
-    return SimulationFrame(time=float(time), region=region, points=points)
-
-
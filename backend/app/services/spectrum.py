@@ -6,6 +6,7 @@
 
 import math
 import random
+from typing import List, Optional
 
 import numpy as np
 
@@ -88,60 +89,82 @@ def _generate_pm_spectrum(
         n_dir,
     )
 
-    components = []
-
-    for freq in frequencies:
-        omega = 2.0 * math.pi * freq  # 角频率
-
-        # PM 光谱密度
-        if omega > 0:
-            S = (
-                PM_ALPHA
-                * G**2
-                / (omega**5)
-                * np.exp(-PM_BETA * (omega_p / omega) ** 4)
-            )
-        else:
-            S = 0.0
-
-        # 方向分布（余弦分布）
-        for direction_deg in directions:
-            # 计算方向权重（相对于主浪向）
-            angle_diff = abs(direction_deg - main_direction)
-            if angle_diff > spread / 2.0:
-                continue
-
-            # 余弦方向分布
-            angle_rad = math.radians(angle_diff)
-            dir_weight = math.cos(angle_rad) ** 2
-
-            # 该频率-方向的能量
-            energy = S * dir_weight * df * (spread / n_dir)
-
-            # 计算振幅（从能量密度）
-            # 能量密度 S(ω,θ) 与振幅的关系：A = sqrt(2 * S * dω * dθ)
-            amplitude = math.sqrt(2.0 * energy) if energy > 0 else 0.0
-
-            if amplitude > 1e-6:  # 忽略太小的振幅
-                # 随机相位
-                phase = random.uniform(0, 2 * math.pi)
-
-                # 计算波数（深水波：k = ω² / g）
-                k = omega**2 / G
-
-                components.append(
-                    WaveComponent(
-                        frequency=freq,
-                        direction_deg=direction_deg,
-                        amplitude=amplitude,
-                        phase=phase,
-                        wave_number=k,
-                    )
-                )
+    # 以下按 (频率, 方向) 二维数组整体计算，行为频率、列为方向
+    omegas = 2.0 * math.pi * frequencies  # 角频率
+
+    # PM 光谱密度（频率下限为正，ω > 0）
+    S = PM_ALPHA * G**2 / omegas**5 * np.exp(-PM_BETA * (omega_p / omegas) ** 4)
+
+    # 方向分布（余弦分布），超出扩展角范围的方向权重为 0
+    angle_diff = np.abs(directions - main_direction)
+    dir_weight = np.where(
+        angle_diff > spread / 2.0, 0.0, np.cos(np.radians(angle_diff)) ** 2
+    )
+
+    # 各频率-方向的能量
+    energy = S[:, None] * dir_weight[None, :] * df * (spread / n_dir)
+
+    # 计算振幅（从能量密度）
+    # 能量密度 S(ω,θ) 与振幅的关系：A = sqrt(2 * S * dω * dθ)
+    amplitude = np.sqrt(2.0 * np.maximum(energy, 0.0))
+
+    # 忽略太小的振幅；保留项按频率优先、方向其次的顺序排列
+    freq_idx, dir_idx = np.nonzero(amplitude > 1e-6)
+
+    # 随机相位：一次生成全部相位；种子取自 random 模块，random.seed 仍可使结果可复现
+    rng = np.random.default_rng(random.getrandbits(64))
+    phases = rng.uniform(0.0, 2.0 * math.pi, size=len(freq_idx))
+
+    # 计算波数（深水波：k = ω² / g）
+    wave_numbers = omegas**2 / G
+
+    components = [
+        WaveComponent(
+            frequency=freq,
+            direction_deg=direction_deg,
+            amplitude=amp,
+            phase=phase,
+            wave_number=k,
+        )
+        for freq, direction_deg, amp, phase, k in zip(
+            frequencies[freq_idx].tolist(),
+            directions[dir_idx].tolist(),
+            amplitude[freq_idx, dir_idx].tolist(),
+            phases.tolist(),
+            wave_numbers[freq_idx].tolist(),
+        )
+    ]
 
     return WaveSpectrum(
-        components=components,
+        components=_dominant_components(
+            components, config.energy_coverage, config.max_components
+        ),
         Hs=config.Hs,
         Tp=config.Tp,
         main_direction_deg=main_direction,
     )
+
+
+def _dominant_components(
+    components: List[WaveComponent],
+    energy_coverage: float,
+    max_components: Optional[int] = None,
+) -> List[WaveComponent]:
+    """
+    按能量（振幅平方）从大到小保留波成分，直到累计能量达到总能量的 energy_coverage，
+    且保留的成分数不超过 max_components。
+
+    谱的高频尾部与方向分布边缘有大量能量很小的波成分，每个成分的计算量相同，
+    对海浪场几乎没有贡献；裁剪后每个时间步的计算量随成分数成比例减少。
+    保留的波成分维持原有顺序。
+    """
+    if not components:
+        return components
+    energy = np.array([c.amplitude for c in components]) ** 2
+    order = np.argsort(-energy, kind="stable")
+    cumulative = np.cumsum(energy[order])
+    n_keep = int(np.searchsorted(cumulative, energy_coverage * cumulative[-1])) + 1
+    if max_components is not None:
+        n_keep = min(n_keep, max_components)
+    keep = np.sort(order[:n_keep])
+    return [components[i] for i in keep.tolist()]
@@ -2,18 +2,28 @@
 通用工具函数模块。
 """
 
-from app.utils.coordinate import create_grid, lonlat_to_xy, xy_to_lonlat
+from app.utils.coordinate import (
+    create_grid,
+    lonlat_to_xy,
+    lonlat_to_xy_array,
+    xy_to_lonlat,
+)
 from app.utils.numerical import (
     bilinear_interpolation,
+    bilinear_interpolation_xy,
     find_grid_cell,
+    find_nearest_index,
     linear_interpolation,
 )
 
 __all__ = [
     "lonlat_to_xy",
+    "lonlat_to_xy_array",
     "xy_to_lonlat",
     "create_grid",
     "bilinear_interpolation",
+    "bilinear_interpolation_xy",
     "linear_interpolation",
     "find_grid_cell",
+    "find_nearest_index",
 ]
@@ -52,6 +52,35 @@ def lonlat_to_xy(
     return x, y
 
 
+def lonlat_to_xy_array(
+    lons: np.ndarray, lats: np.ndarray, origin_lon: float, origin_lat: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    将经纬度数组批量转换为本地平面坐标（米）。
+
+    与 lonlat_to_xy 使用相同的平面近似，按 NumPy 数组整体计算。
+
+    Args:
+        lons: 经度数组（度）
+        lats: 纬度数组（度）
+        origin_lon: 原点经度（度）
+        origin_lat: 原点纬度（度）
+
+    Returns:
+        (x, y) 本地坐标数组（米），x 指向东，y 指向北
+    """
+    lon_rad = np.radians(np.asarray(lons, dtype=np.float64))
+    lat_rad = np.radians(np.asarray(lats, dtype=np.float64))
+    origin_lon_rad = math.radians(origin_lon)
+    origin_lat_rad = math.radians(origin_lat)
+
+    avg_lat_rad = (lat_rad + origin_lat_rad) / 2.0
+    x = (lon_rad - origin_lon_rad) * EARTH_RADIUS * np.cos(avg_lat_rad)
+    y = (lat_rad - origin_lat_rad) * EARTH_RADIUS
+
+    return x, y
+
+
 def xy_to_lonlat(
     x: float, y: float, origin_lon: float, origin_lat: float
 ) -> Tuple[float, float]:
@@ -120,23 +149,26 @@ def create_grid(
     origin_lon = (region.lon_min + region.lon_max) / 2.0
     origin_lat = (region.lat_min + region.lat_max) / 2.0
 
+    # 按照 lat（外层）、lon（内层）的顺序展开网格，整体计算本地坐标与深度
+    grid_lons, grid_lats = np.meshgrid(lon_values, lat_values)
+    grid_lons = grid_lons.ravel()
+    grid_lats = grid_lats.ravel()
+    xs, ys = lonlat_to_xy_array(grid_lons, grid_lats, origin_lon, origin_lat)
+
     # 深度插值（简单线性插值）
     depth_range = region.depth_max - region.depth_min
-
-    grid_points = []
-    for lat in lat_values:
-        for lon in lon_values:
-            # 计算本地坐标
-            x, y = lonlat_to_xy(lon, lat, origin_lon, origin_lat)
-
-            # 计算深度（简单线性插值）
-            lon_ratio = (lon - region.lon_min) / lon_range if lon_range > 0 else 0.5
-            lat_ratio = (lat - region.lat_min) / lat_range if lat_range > 0 else 0.5
-            depth = region.depth_min + depth_range * (lon_ratio + lat_ratio) / 2.0
-
-            grid_points.append(
-                GridPoint(x=x, y=y, lon=lon, lat=lat, depth=depth)
-            )
-
-    return grid_points
-
+    lon_ratio = (grid_lons - region.lon_min) / lon_range if lon_range > 0 else 0.5
+    lat_ratio = (grid_lats - region.lat_min) / lat_range if lat_range > 0 else 0.5
+    depths = region.depth_min + depth_range * (lon_ratio + lat_ratio) / 2.0
+    depths = np.broadcast_to(depths, grid_lons.shape)
+
+    return [
+        GridPoint(x=x, y=y, lon=lon, lat=lat, depth=depth)
+        for x, y, lon, lat, depth in zip(
+            xs.tolist(),
+            ys.tolist(),
+            grid_lons.tolist(),
+            grid_lats.tolist(),
+            depths.tolist(),
+        )
+    ]
@@ -0,0 +1,19 @@
+"""
+GPU 计算支持。
+
+CuPy 为可选依赖（pip install -e ".[gpu]"，需与本机 CUDA 版本匹配）：
+- 已安装且存在可用的 CUDA 设备时，CUPY_AVAILABLE 为 True，cp 即 cupy 模块；
+- 否则 CUPY_AVAILABLE 为 False，cp 为 None，相关计算在 CPU 上进行。
+"""
+
+try:
+    import cupy as cp
+
+    CUPY_AVAILABLE = cp.cuda.runtime.getDeviceCount() > 0
+except Exception:
+    # 未安装 cupy（ImportError），或已安装但没有可用的 CUDA 驱动/设备
+    cp = None
+    CUPY_AVAILABLE = False
+
+
+__all__ = ["CUPY_AVAILABLE", "cp"]
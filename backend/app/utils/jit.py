@@ -0,0 +1,28 @@
+"""
+JIT 编译支持。
+
+Numba 为可选依赖（pip install -e ".[accel]"）：
+- 已安装时，njit / prange 即 numba 提供的实现，数值内核会被编译为机器码；
+- 未安装时，njit 原样返回被装饰的函数，prange 退化为 range，行为不变，仅失去加速。
+"""
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """numba.njit 的占位实现：直接返回原函数。"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+__all__ = ["NUMBA_AVAILABLE", "njit", "prange"]
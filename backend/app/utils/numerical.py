@@ -4,6 +4,7 @@
 提供插值、数值计算等功能。
 """
 
+import bisect
 from typing import List, Optional, Tuple
 
 import numpy as np
@@ -28,24 +29,39 @@ def bilinear_interpolation(
     Returns:
         插值结果
     """
-    if len(grid_points) < 4:
+    point_xs = np.array([p.x for p in grid_points], dtype=np.float64)
+    point_ys = np.array([p.y for p in grid_points], dtype=np.float64)
+    return bilinear_interpolation_xy(x, y, point_xs, point_ys, values)
+
+
+def bilinear_interpolation_xy(
+    x: float, y: float, point_xs: np.ndarray, point_ys: np.ndarray, values: np.ndarray
+) -> float:
+    """
+    双线性插值（网格点坐标为 SoA 数组）。
+
+    与 bilinear_interpolation 相同，但直接使用网格点坐标数组，整体计算距离，
+    不逐点访问 GridPoint 属性。
+
+    Args:
+        x: 查询点 x 坐标（本地坐标，米）
+        y: 查询点 y 坐标（本地坐标，米）
+        point_xs: 网格点 x 坐标数组，shape: (n_points,)
+        point_ys: 网格点 y 坐标数组，shape: (n_points,)
+        values: 网格点对应的值数组，shape: (n_points,)
+
+    Returns:
+        插值结果
+    """
+    distances = np.hypot(point_xs - x, point_ys - y)
+    if len(distances) < 4:
         # 如果网格点太少，使用最近邻
-        distances = np.array(
-            [
-                np.sqrt((p.x - x) ** 2 + (p.y - y) ** 2)
-                for p in grid_points
-            ]
-        )
         idx = np.argmin(distances)
         return float(values[idx])
 
     # 找到包含点 (x, y) 的网格单元
     # 简化实现：找到最近的 4 个点
-    distances = np.array(
-        [np.sqrt((p.x - x) ** 2 + (p.y - y) ** 2) for p in grid_points]
-    )
     nearest_indices = np.argsort(distances)[:4]
-    nearest_points = [grid_points[i] for i in nearest_indices]
 
     # 使用这 4 个点进行双线性插值
     # 简化：使用加权平均（距离倒数加权）
@@ -62,6 +78,8 @@ def linear_interpolation(
     """
     线性插值。
 
+    v1、v2 也可以是形状相同的数组，此时对所有元素整体插值。
+
     Args:
         t: 查询时间
         t1: 时间点 1
@@ -79,6 +97,30 @@ def linear_interpolation(
     return v1 + alpha * (v2 - v1)
 
 
+def find_nearest_index(sorted_values: np.ndarray, target: float) -> int:
+    """
+    在升序数组中查找与 target 最接近的元素索引。
+
+    使用二分查找（O(log N)），不分配临时数组。距离相同时取较小的索引，
+    与 np.argmin(np.abs(sorted_values - target)) 的结果一致。
+    单个标量查找使用 bisect（比 np.searchsorted 的调用开销小）。
+
+    Args:
+        sorted_values: 升序数组（非空）
+        target: 目标值
+
+    Returns:
+        最接近元素的索引
+    """
+    n = len(sorted_values)
+    idx = bisect.bisect_left(sorted_values, target)
+    if idx >= n:
+        return n - 1
+    if idx > 0 and target - sorted_values[idx - 1] <= sorted_values[idx] - target:
+        return idx - 1
+    return idx
+
+
 def find_grid_cell(
     x: float, y: float, grid_points: List[GridPoint]
 ) -> Optional[Tuple[int, int, int, int]]:
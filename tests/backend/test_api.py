@@ -5,12 +5,30 @@ API 端点测试。
 """
 
 import asyncio
+import base64
 import time
+from typing import Optional
+
+import numpy as np
 import pytest
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
 
+from app.api import simulation as simulation_api
+from app.core.config import settings
+from app.core.storage import task_storage
+from app.core.task_manager import create_simulation_task
 from app.main import app
+from app.schemas.api import SimulationFramesResponse
+from app.schemas.base import (
+    DiscretizationConfig,
+    Region,
+    SpectrumConfig,
+    TimeConfig,
+    WindConfig,
+)
+from app.schemas.data import ArraySimulationFrame, CompactSimulationFrame
+from app.services.simulation_stream import SimulationStepper
 
 # 延迟初始化 client，避免在导入时出错
 @pytest.fixture
@@ -30,10 +48,16 @@ async def async_client():
         yield ac
 
 
-@pytest.fixture
-def simulation_id(client):
-    """创建模拟任务并返回 ID。"""
-    request_data = {
+def _simulation_request(
+    time_config: dict, discretization: Optional[dict] = None
+) -> dict:
+    """
+    构建创建模拟任务的请求体。
+
+    区域、风场与波浪谱参数各测试相同；time_config 为时间配置，
+    discretization 为离散化配置（默认使用点数很少的粗网格）。
+    """
+    return {
         "region": {
             "lon_min": 120.0,
             "lat_min": 35.0,
@@ -42,25 +66,24 @@ def simulation_id(client):
             "lat_max": 35.1,
             "depth_max": 20.0,
         },
-        "wind": {
-            "wind_speed": 10.0,
-            "wind_direction_deg": 270.0,
-        },
-        "spectrum": {
-            "spectrum_model_type": "PM",
-            "Hs": 2.0,
-            "Tp": 8.0,
-        },
-        "discretization": {
-            "dx": 0.01,
-            "dy": 0.01,
-            "max_points": 100,
-        },
-        "time": {
+        "wind": {"wind_speed": 10.0, "wind_direction_deg": 270.0},
+        "spectrum": {"spectrum_model_type": "PM", "Hs": 2.0, "Tp": 8.0},
+        "discretization": discretization
+        or {"dx": 0.05, "dy": 0.05, "max_points": 50},
+        "time": time_config,
+    }
+
+
+@pytest.fixture
+def simulation_id(client):
+    """创建模拟任务并返回 ID。"""
+    request_data = _simulation_request(
+        {
             "dt_backend": 0.01,  # 使用更小的时间步长，加快测试速度
             "T_total": 0.1,  # 使用更短的总时长，加快测试速度
         },
-    }
+        discretization={"dx": 0.01, "dy": 0.01, "max_points": 100},
+    )
 
     response = client.post("/api/simulate/area", json=request_data)
     assert response.status_code == 201
@@ -113,34 +136,13 @@ def test_health(client):
 
 def test_create_simulation(client):
     """测试创建区域模拟任务。"""
-    request_data = {
-        "region": {
-            "lon_min": 120.0,
-            "lat_min": 35.0,
-            "depth_min": 10.0,
-            "lon_max": 120.1,
-            "lat_max": 35.1,
-            "depth_max": 20.0,
-        },
-        "wind": {
-            "wind_speed": 10.0,
-            "wind_direction_deg": 270.0,
-        },
-        "spectrum": {
-            "spectrum_model_type": "PM",
-            "Hs": 2.0,
-            "Tp": 8.0,
-        },
-        "discretization": {
-            "dx": 0.01,
-            "dy": 0.01,
-            "max_points": 100,
-        },
-        "time": {
+    request_data = _simulation_request(
+        {
             "dt_backend": 0.01,  # 更小的时间步长，加快测试速度
             "T_total": 0.1,  # 更短的总时长，加快测试速度
         },
-    }
+        discretization={"dx": 0.01, "dy": 0.01, "max_points": 100},
+    )
 
     response = client.post("/api/simulate/area", json=request_data)
     assert response.status_code == 201
@@ -214,6 +216,53 @@ def test_get_simulation_frames(client, simulation_id):
     data2 = response2.json()
     assert len(data2["frames"]) == 1
     assert data2["frames"][0]["time"] == frame_time
+    # 第二次请求命中帧缓存，内容应与首次一致且符合响应模型
+    assert data2["frames"][0] == frame
+    SimulationFramesResponse.parse_obj(data2)
+
+    # 数组格式：每个点为 [lon, lat, wave_height]
+    response3 = client.get(
+        f"/api/query/simulation/{simulation_id}/frames",
+        params={"time": frame_time, "point_format": "array"},
+    )
+    assert response3.status_code == 200
+    frame3 = response3.json()["frames"][0]
+    assert frame3["time"] == frame_time
+    assert frame3["points"] == [
+        [p["lon"], p["lat"], p["wave_height"]] for p in frame["points"]
+    ]
+    # 各格式的响应均符合响应模型（帧为对应格式的结构）
+    assert isinstance(
+        SimulationFramesResponse.parse_obj(response3.json()).frames[0],
+        ArraySimulationFrame,
+    )
+
+    # 列式格式：lon、lat、wave_height 各为一个数组
+    response4 = client.get(
+        f"/api/query/simulation/{simulation_id}/frames",
+        params={"time": frame_time, "point_format": "columns"},
+    )
+    assert response4.status_code == 200
+    assert isinstance(
+        SimulationFramesResponse.parse_obj(response4.json()).frames[0],
+        CompactSimulationFrame,
+    )
+    frame4 = CompactSimulationFrame.parse_obj(response4.json()["frames"][0])
+    assert frame4.time == frame_time
+    for key in ("lon", "lat", "wave_height"):
+        assert getattr(frame4, key) == [p[key] for p in frame["points"]]
+
+    # 列式 + float32 二进制：海浪高度为小端 float32 数组的 base64 编码
+    response5 = client.get(
+        f"/api/query/simulation/{simulation_id}/frames",
+        params={"time": frame_time, "point_format": "columns_f32"},
+    )
+    assert response5.status_code == 200
+    frame5 = CompactSimulationFrame.parse_obj(response5.json()["frames"][0])
+    assert frame5.wave_height is None
+    assert frame5.lon == frame4.lon
+    heights = np.frombuffer(base64.b64decode(frame5.wave_height_f32), dtype="<f4")
+    np.testing.assert_array_equal(heights, np.array(frame4.wave_height, dtype=np.float32))
 
 
 def test_query_point(client, simulation_id):
@@ -262,33 +311,10 @@ def test_invalid_query(client):
 @pytest.mark.anyio
 async def test_pause_resume_and_stop(async_client):
     """测试暂停、恢复与停止接口。"""
-    request_data = {
-        "region": {
-            "lon_min": 120.0,
-            "lat_min": 35.0,
-            "depth_min": 10.0,
-            "lon_max": 120.1,
-            "lat_max": 35.1,
-            "depth_max": 20.0,
-        },
-        "wind": {
-            "wind_speed": 10.0,
-            "wind_direction_deg": 270.0,
-        },
-        "spectrum": {
-            "spectrum_model_type": "PM",
-            "Hs": 2.0,
-            "Tp": 8.0,
-        },
-        "discretization": {
-            "dx": 0.02,
-            "dy": 0.02,
-            "max_points": 200,
-        },
-        "time": {
-            "dt_backend": 0.05,  # 不设置 T_total，进入无限模式
-        },
-    }
+    request_data = _simulation_request(
+        {"dt_backend": 0.05},  # 不设置 T_total，进入无限模式
+        discretization={"dx": 0.02, "dy": 0.02, "max_points": 200},
+    )
 
     response = await async_client.post("/api/simulate/area", json=request_data)
     assert response.status_code == 201
@@ -305,7 +331,166 @@ async def test_pause_resume_and_stop(async_client):
     assert resume_resp.status_code == 200
     assert resume_resp.json()["status"] == "running"
 
+    # 暂停期间停止：模拟循环应被立即唤醒并回收资源
+    await async_client.post(f"/api/simulation/{simulation_id}/clock/pause")
     stop_resp = await async_client.post(f"/api/simulation/{simulation_id}/stop")
     assert stop_resp.status_code == 200
     assert stop_resp.json()["status"] == "stopped"
 
+    await asyncio.sleep(0.05)
+    task = task_storage.get_task(simulation_id)
+    assert task.frame_times.size == 0
+
+
+@pytest.mark.anyio
+async def test_virtual_clock_runs_faster_than_realtime(async_client):
+    """测试虚拟时钟模式：不等待真实时间，按计算速度完成模拟。"""
+    request_data = _simulation_request({
+        "dt_backend": 1.0,
+        "T_total": 20.0,  # 实时模式下需要 20 秒
+        "realtime": False,
+    })
+
+    response = await async_client.post("/api/simulate/area", json=request_data)
+    assert response.status_code == 201
+    simulation_id = response.json()["simulation_id"]
+
+    status = None
+    for _ in range(50):
+        await asyncio.sleep(0.1)
+        response = await async_client.get(
+            f"/api/query/simulation/{simulation_id}/frames", params={"time": -1}
+        )
+        data = response.json()
+        status = data["status"]
+        if status == "completed":
+            break
+
+    assert status == "completed"
+    assert data["frames"][0]["time"] == pytest.approx(20.0)
+
+
+@pytest.mark.anyio
+async def test_stop_interrupts_tick_wait(async_client):
+    """测试停止请求会立即打断实时模式下的节拍等待。"""
+    request_data = _simulation_request({"dt_backend": 10.0})  # 每步等待 10 秒
+
+    response = await async_client.post("/api/simulate/area", json=request_data)
+    assert response.status_code == 201
+    simulation_id = response.json()["simulation_id"]
+
+    await asyncio.sleep(0.1)
+    stop_resp = await async_client.post(f"/api/simulation/{simulation_id}/stop")
+    assert stop_resp.json()["status"] == "stopped"
+
+    # 模拟循环无需等完当前时间步即退出并回收资源
+    await asyncio.sleep(0.1)
+    task = task_storage.get_task(simulation_id)
+    assert task.frame_times.size == 0
+
+
+@pytest.mark.anyio
+async def test_stop_all_simulations(async_client):
+    """测试停止所有运行中的仿真任务。"""
+    request_data = _simulation_request({"dt_backend": 1.0})
+
+    simulation_ids = []
+    for _ in range(2):
+        response = await async_client.post("/api/simulate/area", json=request_data)
+        assert response.status_code == 201
+        simulation_ids.append(response.json()["simulation_id"])
+
+    response = await async_client.post("/api/simulations/stop-all")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["stopped_count"] == data["running_tasks"] >= 2
+
+    for simulation_id in simulation_ids:
+        task = task_storage.get_task(simulation_id)
+        assert task.status.value == "stopped"
+        assert task.stop_event.is_set()
+
+
+@pytest.mark.anyio
+async def test_max_simulations_limit(async_client, monkeypatch):
+    """测试达到同时运行的模拟任务数上限时拒绝创建新任务。"""
+    request_data = _simulation_request({"dt_backend": 1.0})
+    # 只允许在当前已运行的模拟之外再启动一个
+    monkeypatch.setattr(
+        settings, "max_simulations", len(simulation_api._stream_tasks) + 1
+    )
+
+    response = await async_client.post("/api/simulate/area", json=request_data)
+    assert response.status_code == 201
+    simulation_id = response.json()["simulation_id"]
+
+    response = await async_client.post("/api/simulate/area", json=request_data)
+    assert response.status_code == 503
+
+    await async_client.post(f"/api/simulation/{simulation_id}/stop")
+
+
+@pytest.mark.anyio
+async def test_max_simulations_limit_concurrent_requests(async_client, monkeypatch):
+    """测试并发创建模拟任务时同样不超过上限（步进器初始化期间名额已被占用）。"""
+    request_data = _simulation_request({"dt_backend": 1.0})
+    monkeypatch.setattr(
+        settings, "max_simulations", len(simulation_api._stream_tasks) + 1
+    )
+
+    responses = await asyncio.gather(
+        *(async_client.post("/api/simulate/area", json=request_data) for _ in range(4))
+    )
+    status_codes = sorted(response.status_code for response in responses)
+    assert status_codes == [201, 503, 503, 503]
+    assert simulation_api._pending_simulations == 0
+
+    for response in responses:
+        if response.status_code == 201:
+            simulation_id = response.json()["simulation_id"]
+            await async_client.post(f"/api/simulation/{simulation_id}/stop")
+
+
+@pytest.mark.anyio
+async def test_stream_task_unhandled_error_marks_failed():
+    """测试模拟后台任务以未处理的异常结束时，任务被标记为失败并移出任务表。"""
+    simulation_id = create_simulation_task(
+        region=Region(
+            lon_min=120.0, lat_min=35.0, depth_min=10.0,
+            lon_max=120.1, lat_max=35.1, depth_max=20.0,
+        ),
+        wind_config=WindConfig(),
+        spectrum_config=SpectrumConfig(),
+        discretization_config=DiscretizationConfig(),
+        time_config=TimeConfig(),
+    )
+
+    async def broken_stream():
+        raise RuntimeError("boom")
+
+    simulation_api._start_stream_task(simulation_id, broken_stream())
+    await asyncio.sleep(0.01)
+
+    assert simulation_id not in simulation_api._stream_tasks
+    assert task_storage.get_task(simulation_id).status.value == "failed"
+
+
+@pytest.mark.anyio
+async def test_precompute_error_marks_failed(async_client, monkeypatch):
+    """测试预计算帧出错时模拟被标记为失败，而不是当作正常完成或一直运行。"""
+    def broken_compute_frame(self, current_time):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(SimulationStepper, "_compute_frame", broken_compute_frame)
+    request_data = _simulation_request({"dt_backend": 1.0, "realtime": False})
+
+    response = await async_client.post("/api/simulate/area", json=request_data)
+    assert response.status_code == 201
+    simulation_id = response.json()["simulation_id"]
+
+    for _ in range(50):
+        await asyncio.sleep(0.1)
+        if simulation_id not in simulation_api._stream_tasks:
+            break
+
+    assert task_storage.get_task(simulation_id).status.value == "failed"
@@ -4,9 +4,24 @@
 测试核心服务模块的基本功能。
 """
 
-import pytest
+import asyncio
+import math
+import random
+import time
+
 import numpy as np
+import pytest
 
+from app.api.simulation import (
+    _append_frame_with_retention,
+    _frame_capacity,
+    _reserve_frame_buffer,
+)
+from app.core.storage import TaskStorage
+from app.models.frame import WaveFrame
+from app.models.grid import GridPoint, WaveGrid
+from app.models.simulation import SimulationTask
+from app.models.spectrum import WaveComponent
 from app.models.wind import WindField
 from app.schemas.base import (
     DiscretizationConfig,
@@ -15,9 +30,45 @@ from app.schemas.base import (
     TimeConfig,
     WindConfig,
 )
-from app.services.spectrum import generate_spectrum
+from app.schemas.data import SimulationStatus
+from app.services.clock import RealTimeTickSource, TickSource
+from app.services.interpolation import query_point, query_point_from_frame
+from app.services.simulation import (
+    SharedWaveField,
+    WaveFieldEvaluator,
+    _superpose_components,
+    compute_shared_wave_field,
+    compute_wave_field,
+    create_wave_grid,
+    grid_xy,
+)
+from app.services.simulation_stream import SimulationStepper
+from app.services.spectrum import _dominant_components, generate_spectrum
 from app.services.wind import create_wind_field
-from app.utils.coordinate import create_grid, lonlat_to_xy
+from app.utils.coordinate import (
+    create_grid,
+    lonlat_to_xy,
+    lonlat_to_xy_array,
+    xy_to_lonlat,
+)
+from app.utils.numerical import find_nearest_index
+
+
+def _region(size: float) -> Region:
+    """测试用的正方形小区域：西南角 (120°E, 30°N)，边长 size 度。"""
+    return Region(
+        lon_min=120.0, lat_min=30.0, depth_min=10.0,
+        lon_max=120.0 + size, lat_max=30.0 + size, depth_max=20.0,
+    )
+
+
+@pytest.fixture
+def wave_setup():
+    """海浪场计算测试的公共数据：(网格点, 默认波浪谱, 网格点 x 坐标, 网格点 y 坐标)。"""
+    grid_points = create_grid(_region(0.05), DiscretizationConfig(dx=0.01, dy=0.01))
+    spectrum = generate_spectrum(create_wind_field(WindConfig()), SpectrumConfig())
+    xs, ys = grid_xy(grid_points)
+    return grid_points, spectrum, xs, ys
 
 
 def test_wind_field_creation():
@@ -55,6 +106,22 @@ def test_spectrum_generation():
     assert spectrum.Tp == 8.0
     assert len(spectrum.components) > 0
 
+    # 只保留累计能量达到 99.9% 的主要波成分，保持原有顺序
+    components = [
+        WaveComponent(
+            frequency=0.1, direction_deg=0.0, amplitude=amplitude, phase=0.0, wave_number=0.01
+        )
+        for amplitude in (1.0, 0.01, 0.5, 0.001)
+    ]
+    assert [c.amplitude for c in _dominant_components(components, 0.999)] == [1.0, 0.5]
+    # 成分数上限优先于能量比例
+    assert [c.amplitude for c in _dominant_components(components, 0.999, 1)] == [1.0]
+
+    capped = generate_spectrum(
+        wind, spectrum_config.copy(update={"max_components": 10})
+    )
+    assert len(capped.components) == 10
+
 
 def test_coordinate_conversion():
     """测试坐标转换。"""
@@ -66,12 +133,19 @@ def test_coordinate_conversion():
     assert x > 0  # 向东应该是正x
 
     # 测试本地坐标转经纬度
-    from app.utils.coordinate import xy_to_lonlat
-
     lon, lat = xy_to_lonlat(x, y, origin_lon, origin_lat)
     assert abs(lon - 120.1) < 0.01
     assert abs(lat - 35.0) < 0.01
 
+    # 批量转换与逐点转换结果一致
+    lons = np.array([119.9, 120.0, 120.1, 120.25])
+    lats = np.array([34.9, 35.0, 35.1, 35.3])
+    xs, ys = lonlat_to_xy_array(lons, lats, origin_lon, origin_lat)
+    for lon, lat, x, y in zip(lons, lats, xs, ys):
+        expected_x, expected_y = lonlat_to_xy(lon, lat, origin_lon, origin_lat)
+        assert x == pytest.approx(expected_x)
+        assert y == pytest.approx(expected_y)
+
 
 def test_grid_creation():
     """测试网格创建。"""
@@ -99,3 +173,277 @@ def test_grid_creation():
     assert min(lats) >= region.lat_min
     assert max(lats) <= region.lat_max
 
+
+def test_find_nearest_index():
+    """测试升序数组中的最近索引查找。"""
+    times = np.array([0.0, 0.2, 0.4, 0.6])
+
+    # 与 argmin(|times - t|) 的结果一致（距离相同时取较小索引）
+    for target in [-1.0, 0.0, 0.05, 0.1, 0.29, 0.5, 0.6, 10.0]:
+        assert find_nearest_index(times, target) == int(
+            np.argmin(np.abs(times - target))
+        )
+
+
+def test_query_point_bilinear():
+    """测试规则网格上的时空插值。"""
+    lons = np.linspace(120.0, 120.1, 5)
+    lats = np.linspace(35.0, 35.1, 4)
+    grid_points = [
+        GridPoint(x=0.0, y=0.0, lon=lon, lat=lat, depth=10.0)
+        for lat in lats
+        for lon in lons
+    ]
+    times = np.array([0.0, 0.2, 0.4])
+    wave_heights = np.random.default_rng(0).random((len(times), len(grid_points)))
+    wave_grid = WaveGrid(grid_points=grid_points, wave_heights=wave_heights, times=times)
+
+    # 网格节点、时间节点上取原值
+    height = query_point(wave_grid, lons[2], lats[1], 0.2)
+    assert abs(height - wave_heights[1, 1 * len(lons) + 2]) < 1e-12
+
+    # 单元中心、两帧中间时刻：四角点与两帧的平均值
+    height = query_point(
+        wave_grid, (lons[0] + lons[1]) / 2, (lats[0] + lats[1]) / 2, 0.1
+    )
+    expected = wave_heights[:2][:, [0, 1, len(lons), len(lons) + 1]].mean()
+    assert abs(height - expected) < 1e-9
+
+
+def test_query_point_from_frame():
+    """测试单帧快速插值与网格插值结果一致。"""
+    lons = np.linspace(120.0, 120.1, 5)
+    lats = np.linspace(35.0, 35.1, 4)
+    grid_lons, grid_lats = [a.ravel() for a in np.meshgrid(lons, lats)]
+    heights = np.random.default_rng(0).random(len(grid_lons))
+
+    # 帧内点顺序与网格顺序不同
+    order = np.random.default_rng(1).permutation(len(grid_lons))
+    frame_heights = heights[order]
+    point_order = np.argsort(order)
+
+    grid_points = [
+        GridPoint(x=0.0, y=0.0, lon=lon, lat=lat, depth=10.0)
+        for lon, lat in zip(grid_lons, grid_lats)
+    ]
+    wave_grid = WaveGrid(
+        grid_points=grid_points, wave_heights=heights[None, :], times=np.array([0.2])
+    )
+    for lon, lat in [(120.013, 35.071), (120.1, 35.0), (119.0, 36.0)]:
+        expected = query_point(wave_grid, lon, lat, 0.2)
+        height = query_point_from_frame(frame_heights, lons, lats, point_order, lon, lat)
+        assert abs(height - expected) < 1e-12
+
+
+def test_task_storage_status_index():
+    """测试任务存储的状态索引。"""
+    region = _region(0.1)
+    storage = TaskStorage()
+    tasks = [
+        SimulationTask(
+            simulation_id=f"task-{i}",
+            status=SimulationStatus.PENDING,
+            region=region,
+            wind_config=WindConfig(),
+            spectrum_config=SpectrumConfig(),
+            discretization_config=DiscretizationConfig(),
+            time_config=TimeConfig(),
+        )
+        for i in range(3)
+    ]
+    for task in tasks:
+        storage.add_task(task)
+
+    storage.set_task_status(tasks[0], SimulationStatus.RUNNING)
+    storage.set_task_status(tasks[1], SimulationStatus.RUNNING)
+    storage.set_task_status(tasks[1], SimulationStatus.STOPPED)
+    storage.remove_task("task-2")
+
+    assert len(storage) == 2
+    assert [t.simulation_id for t in storage.list_tasks(SimulationStatus.RUNNING)] == ["task-0"]
+    assert [t.simulation_id for t in storage.list_tasks(SimulationStatus.STOPPED)] == ["task-1"]
+    assert storage.list_tasks(SimulationStatus.PENDING) == []
+    assert len(storage.list_tasks()) == 2
+
+
+def test_frame_buffer_presized_from_retention():
+    """测试按缓存保留时间预分配帧缓冲区，运行中不再扩容。"""
+    time_config = TimeConfig(dt_backend=0.5, cache_retention_time=2.0)
+    assert _frame_capacity(TimeConfig()) is None
+    assert _frame_capacity(TimeConfig(dt_backend=0.5, T_total=100.0)) == 202
+
+    task = SimulationTask(
+        simulation_id="task-0",
+        status=SimulationStatus.RUNNING,
+        region=_region(0.1),
+        wind_config=WindConfig(),
+        spectrum_config=SpectrumConfig(),
+        discretization_config=DiscretizationConfig(),
+        time_config=time_config,
+    )
+    _reserve_frame_buffer(task, _frame_capacity(time_config), 3)
+    heights_buffer = task.frame_heights_buffer
+
+    n_frames = len(heights_buffer)
+    for i in range(n_frames):
+        t = i * 0.5
+        _append_frame_with_retention(task, WaveFrame(time=t, wave_height=np.full(3, t)), 2.0)
+
+    assert task.frame_heights_buffer is heights_buffer
+    assert task.frame_times.tolist() == [i * 0.5 for i in range(n_frames - 5, n_frames)]
+    np.testing.assert_array_equal(task.frame_heights[:, 0], task.frame_times)
+
+
+def test_realtime_tick_source_does_not_drift():
+    """测试实时节拍源按绝对计划时刻等待，每步的计算耗时不累积为漂移。"""
+    dt = 0.02
+    n_ticks = 20
+
+    async def run():
+        tick_source = RealTimeTickSource()
+        start = time.perf_counter()
+        for _ in range(n_ticks):
+            # 模拟每步占用 dt 的 30% 的处理时间
+            time.sleep(0.3 * dt)
+            await tick_source.wait(dt)
+        return time.perf_counter() - start
+
+    elapsed = asyncio.run(run())
+    # 按“本步开始 + dt”等待时总耗时约为 1.3 * n_ticks * dt
+    assert n_ticks * dt <= elapsed < 1.15 * n_ticks * dt
+
+
+def test_tick_source_requires_wait():
+    """测试节拍源子类未实现 wait() 时在创建时即报错。"""
+
+    class IncompleteTickSource(TickSource):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteTickSource()
+
+
+def test_compute_wave_field_matches_pointwise_sum(wave_setup):
+    """测试海浪场向量化计算与逐点叠加公式一致。"""
+    grid_points, spectrum, xs, ys = wave_setup
+
+    t = 3.7
+    wave_height = compute_wave_field(spectrum, xs, ys, t)
+
+    for i in (0, len(grid_points) // 2, len(grid_points) - 1):
+        point = grid_points[i]
+        expected = 0.0
+        for c in spectrum.components:
+            direction_rad = math.radians(c.direction_deg)
+            kx = c.wave_number * math.sin(direction_rad)
+            ky = c.wave_number * math.cos(direction_rad)
+            expected += c.amplitude * math.cos(
+                kx * point.x + ky * point.y - 2.0 * math.pi * c.frequency * t + c.phase
+            )
+        assert abs(wave_height[i] - expected) < 1e-9
+
+
+def test_wave_field_evaluator_matches_direct_sum(wave_setup):
+    """测试缓存时间无关相位的海浪场计算器与逐成分计算结果一致。"""
+    _, spectrum, xs, ys = wave_setup
+
+    wave_field = WaveFieldEvaluator(spectrum, xs, ys)
+    assert wave_field.coefficients is not None
+    for t in (0.0, 0.2, 137.4):
+        np.testing.assert_allclose(
+            wave_field(t), compute_wave_field(spectrum, xs, ys, t), atol=1e-5
+        )
+
+    # 提供输出数组时结果直接写入其中
+    out = np.empty(len(xs), dtype=np.float32)
+    assert wave_field(0.2, out=out) is out
+    np.testing.assert_array_equal(out, wave_field(0.2))
+
+    # 多个时刻整体计算与逐时刻计算一致
+    times = np.array([0.0, 0.2, 137.4])
+    expected = [wave_field(t) for t in times]
+    np.testing.assert_allclose(wave_field.at_times(times), expected, atol=1e-5)
+
+    # 分块计算（每块一个时刻）结果不变
+    wave_field.TIME_BLOCK_ELEMENTS = 1
+    np.testing.assert_allclose(wave_field.at_times(times), expected, atol=1e-5)
+
+    # 计算进程从共享内存中的系数计算，结果与计算线程完全一致
+    shared_wave_field = SharedWaveField(wave_field)
+    try:
+        wave_height = compute_shared_wave_field(
+            shared_wave_field.name,
+            shared_wave_field.n_components,
+            shared_wave_field.n_points,
+            137.4,
+        )
+    finally:
+        shared_wave_field.release()
+    assert wave_height.dtype == np.float32
+    np.testing.assert_array_equal(wave_height, wave_field(137.4))
+
+
+def test_superpose_components_kernel_matches_compute_wave_field(wave_setup):
+    """测试逐点叠加内核与海浪场计算结果一致（未安装 numba 时按纯 Python 执行）。"""
+    _, spectrum, xs, ys = wave_setup
+
+    t = 12.3
+    kx, ky = spectrum.wave_vectors
+    wave_height = np.zeros(len(xs))
+    _superpose_components(
+        spectrum.amplitudes,
+        kx,
+        ky,
+        spectrum.phases - spectrum.omegas * t,
+        xs,
+        ys,
+        wave_height,
+    )
+    np.testing.assert_allclose(
+        wave_height, compute_wave_field(spectrum, xs, ys, t), atol=1e-9
+    )
+
+
+def test_create_wave_grid_keeps_retention_window():
+    """测试离线网格只计算并保留缓存保留时间内的帧。"""
+    region = _region(0.02)
+    args = (
+        region,
+        WindConfig(),
+        SpectrumConfig(),
+        DiscretizationConfig(dx=0.01, dy=0.01),
+    )
+    # 波成分的初始相位随机生成，两次使用相同的随机种子
+    random.seed(0)
+    full = create_wave_grid(*args, TimeConfig(dt_backend=0.5, T_total=10.0))
+    random.seed(0)
+    kept = create_wave_grid(
+        *args, TimeConfig(dt_backend=0.5, T_total=10.0, cache_retention_time=2.0)
+    )
+
+    assert len(full.times) == 21
+    np.testing.assert_allclose(kept.times, [8.0, 8.5, 9.0, 9.5, 10.0])
+    np.testing.assert_array_equal(kept.wave_heights, full.wave_heights[-5:])
+
+
+def test_stepper_times_are_step_multiples():
+    """测试步进时刻按步数 × dt 计算：不累积浮点误差，总步数与实际帧数一致。"""
+    region = _region(0.01)
+    stepper = SimulationStepper(
+        region,
+        WindConfig(),
+        SpectrumConfig(),
+        DiscretizationConfig(dx=0.01, dy=0.01),
+        TimeConfig(dt_backend=0.2, T_total=0.6),
+    )
+    times = []
+    while True:
+        frame = stepper.step()
+        if frame is None:
+            break
+        times.append(frame.time)
+    assert times == [i * 0.2 for i in range(4)]
+    assert stepper.get_total_steps() == len(times)
+
+    # 长时间运行后仍为 dt 的整数倍
+    assert stepper._time_after(9999 * 0.2) == 10000 * 0.2